@@ -1,6 +1,11 @@
 from manim import *
 import numpy as np
 
+from covering import cylinder_cover
+from grids import RevealGrid, compact_plane
+from surfaces import DeformableSurface, cylinder_wrap_func
+from tracked import TrackedDot
+
 class CoveringR2toCylinder(ThreeDScene):
     def construct(self):
         # Title with the covering map
@@ -12,7 +17,7 @@ class CoveringR2toCylinder(ThreeDScene):
         self.set_camera_orientation(phi=70 * DEGREES, theta=30 * DEGREES, zoom=0.6)
 
         # 1. Show the domain: R^2 plane with colored strips
-        plane = NumberPlane(
+        plane = compact_plane(
             x_range=[-3 * PI, 3 * PI, 2 * PI],
             y_range=[-3, 3, 1],
             x_length=10,
@@ -51,7 +56,7 @@ class CoveringR2toCylinder(ThreeDScene):
                 label.move_to(plane.c2p(2 * PI * i + PI, 2.5))
                 strip_labels.add(label)
         
-        self.play(Create(plane), FadeIn(plane_label))
+        self.play(RevealGrid(plane), FadeIn(plane_label))
         self.play(FadeIn(strips), FadeIn(strip_labels))
 
         # Explanatory text
@@ -124,12 +129,8 @@ class CoveringR2toCylinder(ThreeDScene):
         fund_domain_center = fund_domain_rect.get_center()
         
         # Create surface that starts flat and matches the plane's scaling
-        wrapping_surface = Surface(
-            lambda u, v: np.array([
-                (u - PI) * plane_width / (2 * PI),
-                0,
-                v
-            ]),
+        wrapping_surface = DeformableSurface(
+            lambda u, v, alpha: cylinder_wrap_func(u, v, alpha=alpha, width=plane_width),
             u_range=[0, 2 * PI],
             v_range=[-3, 3],
             resolution=(32, 16),
@@ -155,26 +156,12 @@ class CoveringR2toCylinder(ThreeDScene):
         # Store the final cylinder position for alignment
         final_cylinder_center = fund_domain_center
 
-        # The morphing animation with consistent scaling
+        # The morphing animation with consistent scaling: the surface keeps its
+        # faces and style and only has its points rewritten every frame
         self.play(
             UpdateFromAlphaFunc(
                 wrapping_surface,
-                lambda mob, alpha: mob.become(
-                    Surface(
-                        lambda u, v: np.array([
-                            (1 - alpha) * (u - PI) * plane_width / (2 * PI) + alpha * 2 * np.cos(u),
-                            alpha * 2 * np.sin(u),
-                            v
-                        ]),
-                        u_range=[0, 2 * PI],
-                        v_range=[-3, 3],
-                        resolution=(32, 16),
-                        fill_opacity=0.6,
-                        fill_color=BLUE_D,
-                        stroke_color=BLUE_E,
-                        stroke_width=0.5
-                    ).move_to(final_cylinder_center)  # Keep it aligned during morphing
-                )
+                lambda mob, alpha: mob.set_alpha(alpha).move_to(final_cylinder_center)  # Keep it aligned during morphing
             ),
             run_time=4
         )
@@ -211,16 +198,16 @@ class CoveringR2toCylinder(ThreeDScene):
         )
 
         # FIXED: Moving dot on cylinder with proper alignment
-        dot_on_cyl = always_redraw(
-            lambda: Dot(
-                np.array([
-                    2 * np.cos(t_tracker.get_value()),
-                    2 * np.sin(t_tracker.get_value()),
-                    h_tracker.get_value()
-                ]) + final_cylinder_center,  # Use the same center as the cylinder
-                color=YELLOW,
-                radius=0.08
-            )
+        dot_on_cyl = TrackedDot(
+            lambda t, h: np.array([
+                2 * np.cos(t),
+                2 * np.sin(t),
+                h
+            ]) + final_cylinder_center,  # Use the same center as the cylinder
+            t_tracker,
+            h_tracker,
+            color=YELLOW,
+            radius=0.08
         )
 
         self.play(FadeIn(path_on_cyl), FadeIn(dot_on_cyl))
@@ -245,22 +232,18 @@ class CoveringR2toCylinder(ThreeDScene):
         self.play(FadeIn(sheets_text))
 
         # FIXED: Show multiple colored helices aligned with the cylinder
-        additional_paths = VGroup()
+        # The helix lifted to the next three strips, drawn through the
+        # projection: every lift lands on the same helix
+        cover = cylinder_cover(radius=2, center=final_cylinder_center)
         colors = [GREEN, RED, PURPLE]
-        
-        for i, color in enumerate(colors):
-            shift = 2*PI*(i+1)
-            path = ParametricFunction(
-                lambda t: np.array([
-                    2 * np.cos(t + shift),
-                    2 * np.sin(t + shift),
-                    -3 + 6*t/(4*PI)
-                ]) + final_cylinder_center,  # Use the same center as the cylinder
-                t_range=[0, 4*PI],
-                stroke_color=color,
-                stroke_width=4
-            )
-            additional_paths.add(path)
+        additional_paths = cover.lifts(
+            lambda t: np.stack([t, -3 + 6*t/(4*PI)], axis=-1),
+            t_range=[0, 4*PI],
+            elements=[1, 2, 3],
+            chart=cover.project,
+            colors=colors,
+            stroke_width=4
+        )
 
         self.play(Create(additional_paths), run_time=3)
         self.wait(2)
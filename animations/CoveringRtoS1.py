@@ -1,6 +1,10 @@
 from manim import *
 import numpy as np
 
+from covering import circle_cover, linear_chart
+from instanced import DotCloud, LineSet
+from tracked import TrackedArrow, TrackedDot
+
 class CoveringRtoS1(Scene):
     def construct(self):
         # Title with the covering map
@@ -95,19 +99,16 @@ class CoveringRtoS1(Scene):
         # Tracker for t
         t_tracker = ValueTracker(-3*np.pi)
 
-        dot_R = always_redraw(
-            lambda: Dot(number_line.n2p(t_tracker.get_value()), color=YELLOW)
-        )
-        dot_S1 = always_redraw(
-            lambda: Dot(circle.point_at_angle(t_tracker.get_value()), color=YELLOW)
-        )
+        # Dots and arrow follow t_tracker by moving their own points
+        dot_R = TrackedDot(number_line.n2p, t_tracker, color=YELLOW)
+        dot_S1 = TrackedDot(circle.point_at_angle, t_tracker, color=YELLOW)
 
-        def map_arrow():
-            start = number_line.n2p(t_tracker.get_value())
-            end = circle.point_at_angle(t_tracker.get_value())
-            return Arrow(start, end, buff=0.08, stroke_width=3, max_tip_length_to_length_ratio=0.08)
-
-        arrow = always_redraw(map_arrow)
+        arrow = TrackedArrow(
+            number_line.n2p,
+            circle.point_at_angle,
+            t_tracker,
+            buff=0.08, stroke_width=3, max_tip_length_to_length_ratio=0.08
+        )
 
         # Show the mapping in action
         mapping_text = Tex(
@@ -135,20 +136,17 @@ class CoveringRtoS1(Scene):
         self.play(FadeIn(basepoint), FadeIn(basepoint_label))
 
         # Show all preimages of the point 0 on the circle
-        fiber_dots = VGroup()
-        fiber_arrows = VGroup()
-        for k in k_vals:
-            t = 2*np.pi*k
-            d = Dot(number_line.n2p(t), color=BLUE).scale(0.9)
-            fiber_dots.add(d)
-            a = DashedLine(
-                number_line.n2p(t), 
-                circle.point_at_angle(0), 
-                dash_length=0.12, 
-                stroke_width=2,
-                color=BLUE
-            )
-            fiber_arrows.add(a)
+        cover = circle_cover()
+        to_line = linear_chart(number_line.n2p, 1)
+        fiber_points = to_line(cover.fiber(0, k_vals))
+        fiber_dots = DotCloud(fiber_points, radius=0.9 * DEFAULT_DOT_RADIUS, color=BLUE)
+        fiber_arrows = LineSet(
+            fiber_points,
+            circle.point_at_angle(0),
+            dash_length=0.12,
+            stroke_width=2,
+            color=BLUE
+        )
 
         self.play(FadeIn(fiber_dots), FadeIn(fiber_arrows), run_time=2)
         self.wait(2)
@@ -169,16 +167,12 @@ class CoveringRtoS1(Scene):
         ).set_stroke(GREEN, width=6)
 
         interval_length = 2*np.pi/3
-        preimage_intervals = VGroup()
-        for k in range(-2, 3):
-            center = 2*np.pi*k
-            left = center - interval_length/2
-            right = center + interval_length/2
-            seg = Line(
-                number_line.n2p(left), 
-                number_line.n2p(right)
-            ).set_stroke(GREEN, width=6)
-            preimage_intervals.add(seg)
+        # Endpoints of the interval around 0 and of its deck translates, shape (5, 2, 1)
+        ends = to_line(cover.deck_group.act(
+            np.array([[-interval_length/2], [interval_length/2]]),
+            elements=range(-2, 3)
+        ))
+        preimage_intervals = LineSet(ends[:, 0], ends[:, 1], color=GREEN, stroke_width=6)
 
         self.play(Create(arc))
         self.play(Create(preimage_intervals))
@@ -1,6 +1,9 @@
 from manim import *
 import numpy as np
 
+from paths import AdaptiveParametricFunction
+from surfaces import LevelOfDetail, cylinder_surface, klein_bottle_func, klein_bottle_surface
+
 class KleinBottleVisualization(ThreeDScene):
     def construct(self):
         # Title
@@ -28,7 +31,8 @@ class KleinBottleVisualization(ThreeDScene):
         # 2. Form the cylinder
         self.play(FadeOut(arrows))
         
-        cylinder = Cylinder(radius=4 / (2 * PI), height=4, direction=OUT, fill_opacity=0.5, fill_color=BLUE_D)
+        # A fixed resolution, since the checkerboard grid is part of the picture
+        cylinder = cylinder_surface(radius=4 / (2 * PI), height=4, fill_opacity=0.5, fill_color=BLUE_D)
         
         self.play(
             Transform(square, cylinder),
@@ -38,26 +42,13 @@ class KleinBottleVisualization(ThreeDScene):
         self.wait(1)
 
         # 3. Animate the self-intersection
-        # Define the Klein bottle parametrically (oriented upright)
-        def klein_bottle_func(u, v):
-            u, v = u * 2 * PI, v * 2 * PI
-            r = 4 * (1 - np.cos(u) / 2)
-            x, y, z = 0, 0, 0
-            if 0 <= u < PI:
-                x_temp = 6 * np.cos(u) * (1 + np.sin(u)) + r * np.cos(u) * np.cos(v)
-                z_temp = 16 * np.sin(u) + r * np.sin(u) * np.cos(v)
-            else:
-                x_temp = 6 * np.cos(u) * (1 + np.sin(u)) - r * np.cos(v)
-                z_temp = 16 * np.sin(u)
-            y_temp = r * np.sin(v)
-            # Return rotated coordinates to make it stand up
-            return np.array([x_temp, y_temp, z_temp]) * 0.1
-            
-        klein_bottle = Surface(
-            klein_bottle_func,
-            u_range=[0, 1],
-            v_range=[0, 1],
-            resolution=(100, 32),
+        # The Klein bottle parametrization (oriented upright) lives in surfaces.py
+        # Plain green without face strokes, so its faces can follow the level
+        # of detail; the camera zooms in to 1.2 below
+        klein_bottle = klein_bottle_surface(
+            lod=LevelOfDetail.for_scene(self, max_zoom=1.2),
+            checkerboard_colors=False,
+            stroke_width=0,
             fill_opacity=0.7,
             fill_color=GREEN_D
         )
@@ -78,7 +69,7 @@ class KleinBottleVisualization(ThreeDScene):
 
         # Animate a small frame moving along a path
         path_func = lambda t: klein_bottle_func(t, 0.5)
-        path = ParametricFunction(path_func, t_range=[0, 1], color=YELLOW)
+        path = AdaptiveParametricFunction(path_func, t_range=[0, 1], lod=LevelOfDetail.for_scene(self), color=YELLOW)
         
         # FIX 2: Use a simple dot that changes color to show orientation flip
         dot = Sphere(radius=0.1, color=RED, fill_opacity=0.8)
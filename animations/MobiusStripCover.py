@@ -1,6 +1,10 @@
 from manim import *
 import numpy as np
 
+from glyphs import VectorGlyph
+from paths import AdaptiveParametricFunction
+from surfaces import LevelOfDetail, cylinder_surface, mobius_func, mobius_surface
+
 class MobiusStripCover(ThreeDScene):
     def construct(self):
         # Title
@@ -11,8 +15,8 @@ class MobiusStripCover(ThreeDScene):
         self.set_camera_orientation(phi=70 * DEGREES, theta=315 * DEGREES, zoom=0.9)
 
         # 1. Start with a cylinder
-        cylinder = Cylinder(
-            radius=1.5, height=4, direction=OUT,
+        cylinder = cylinder_surface(
+            radius=1.5, height=4,
             fill_opacity=0.6, fill_color=BLUE_D, resolution=(60, 30)
         ).shift(LEFT * 3.5)
         
@@ -31,16 +35,7 @@ class MobiusStripCover(ThreeDScene):
         self.play(FadeOut(intro_text))
 
         # 2. Define the Möbius strip as a Surface
-        def mobius_func(u, v):
-            x = (1.5 + v * np.cos(u / 2)) * np.cos(u)
-            y = (1.5 + v * np.cos(u / 2)) * np.sin(u)
-            z = v * np.sin(u / 2)
-            return np.array([x, y, z])
-
-        mobius = Surface(
-            lambda u, v: mobius_func(u, v),
-            u_range=[0, TAU],
-            v_range=[-1, 1],
+        mobius = mobius_surface(
             resolution=(60, 30),
             fill_opacity=0.7,
             fill_color=GREEN_D,
@@ -77,8 +72,8 @@ class MobiusStripCover(ThreeDScene):
         self.play(FadeOut(covering_text))
 
         # Show the preimage cylinder
-        cylinder_preimage = Cylinder(
-            radius=1.5, height=4, direction=OUT,
+        cylinder_preimage = cylinder_surface(
+            radius=1.5, height=4,
             fill_opacity=0.1, fill_color=BLUE_D, 
             stroke_color=BLUE_E, stroke_width=1,
             resolution=(60, 30)
@@ -101,7 +96,7 @@ class MobiusStripCover(ThreeDScene):
 
         # Path on Möbius
         mobius_path_func = lambda t: mobius_func(2 * PI * t, 0)
-        mobius_path = ParametricFunction(mobius_path_func, t_range=[0, 2], color=YELLOW, stroke_width=6).shift(RIGHT * 3.5)
+        mobius_path = AdaptiveParametricFunction(mobius_path_func, t_range=[0, 2], lod=LevelOfDetail.for_scene(self), color=YELLOW, stroke_width=6).shift(RIGHT * 3.5)
         mobius_dot = Dot3D(point=mobius_path.get_start(), color=YELLOW, radius=0.08)
 
         # Path on cylinder (2-to-1 cover)
@@ -110,7 +105,7 @@ class MobiusStripCover(ThreeDScene):
             1.5 * np.sin(PI * t),
             2 - 2 * t
         ])
-        cylinder_path = ParametricFunction(cylinder_path_func, t_range=[0, 2], color=YELLOW, stroke_width=6).shift(LEFT * 3.5)
+        cylinder_path = AdaptiveParametricFunction(cylinder_path_func, t_range=[0, 2], lod=LevelOfDetail.for_scene(self), color=YELLOW, stroke_width=6).shift(LEFT * 3.5)
         cylinder_dot = Dot3D(point=cylinder_path.get_start(), color=YELLOW, radius=0.08)
 
         self.play(Create(mobius_path), Create(cylinder_path), FadeIn(mobius_dot), FadeIn(cylinder_dot))
@@ -153,7 +148,7 @@ class MobiusStripCover(ThreeDScene):
 
         # Initial orientation arrow
         start_pos, end_pos = normal_vector_at_t(0)
-        orientation_arrow = Arrow3D(
+        orientation_arrow = VectorGlyph(
             start=start_pos + RIGHT * 3.5,
             end=end_pos + RIGHT * 3.5,
             color=RED,
@@ -165,20 +160,11 @@ class MobiusStripCover(ThreeDScene):
         self.play(FadeIn(orientation_arrow))
         self.wait(1)
 
-        # Animate the orientation flip
+        # Animate the orientation flip by moving the same arrow every frame
         def update_orientation_arrow(mob, alpha):
             t = alpha * 2  # Go around twice to see the flip clearly
             start_pos, end_pos = normal_vector_at_t(t)
-            new_arrow = Arrow3D(
-                start=start_pos + RIGHT * 3.5,
-                end=end_pos + RIGHT * 3.5,
-                color=RED,
-                thickness=0.03,
-                height=0.15,
-                base_radius=0.04
-            )
-            mob.become(new_arrow)
-            return mob
+            return mob.put_start_and_end_on(start_pos + RIGHT * 3.5, end_pos + RIGHT * 3.5)
 
         self.play(
             UpdateFromAlphaFunc(orientation_arrow, update_orientation_arrow),
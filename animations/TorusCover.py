@@ -1,6 +1,11 @@
 from manim import *
 import numpy as np
 
+from covering import linear_chart, torus_cover
+from grids import RevealGrid, compact_plane
+from instanced import DotCloud, LineSet
+from surfaces import LevelOfDetail, MorphingSurface, torus_func, torus_surface
+
 class TorusCover(ThreeDScene):
     def construct(self):
         # Title
@@ -11,7 +16,7 @@ class TorusCover(ThreeDScene):
         self.set_camera_orientation(phi=70 * DEGREES, theta=-45 * DEGREES, zoom=0.8)
 
         # 1. Create the infinite plane with grid
-        plane = NumberPlane(
+        plane = compact_plane(
             x_range=[-4*PI, 4*PI, PI/2],
             y_range=[-4*PI, 4*PI, PI/2],
             x_length=10,
@@ -39,7 +44,7 @@ class TorusCover(ThreeDScene):
             vertical_lines.add(v_line)
             horizontal_lines.add(h_line)
 
-        self.play(Create(plane))
+        self.play(RevealGrid(plane))
         self.play(Create(vertical_lines), Create(horizontal_lines))
 
         # Label for the plane
@@ -50,19 +55,7 @@ class TorusCover(ThreeDScene):
         self.wait(1)
 
         # 2. Create the torus
-        def torus_func(u, v):
-            major_radius = 1.5
-            minor_radius = 0.5
-            return np.array([
-                (major_radius + minor_radius * np.cos(v)) * np.cos(u),
-                (major_radius + minor_radius * np.cos(v)) * np.sin(u),
-                minor_radius * np.sin(v)
-            ])
-
-        torus = Surface(
-            torus_func,
-            u_range=[0, 2*PI],
-            v_range=[0, 2*PI],
+        torus = torus_surface(
             resolution=(40, 40),
             fill_opacity=0.7,
             fill_color=BLUE_D,
@@ -85,39 +78,36 @@ class TorusCover(ThreeDScene):
         covering_text.to_edge(DOWN)
         self.play(FadeIn(covering_text))
 
-        # Create several paths on the plane that map to the same path on torus
-        def create_plane_path(shift_x=0, shift_y=0, color=RED):
-            return ParametricFunction(
-                lambda t: plane.c2p(
-                    2*PI*shift_x + 1.2*np.cos(3*t), 
-                    2*PI*shift_y + 1.2*np.sin(2*t)
-                ),
-                t_range=[0, 2*PI],
-                stroke_color=color,
-                stroke_width=4
-            )
+        # One loop in the fundamental domain; its lifts in other domains are
+        # deck translations of the same samples, and it projects to one path
+        # on the torus
+        cover = torus_cover()
+        lod = LevelOfDetail.for_scene(self)
+        plane_chart = linear_chart(plane.c2p, 2)
 
-        # Create the corresponding single path on torus
-        def torus_path_func(t):
-            u = 1.2*np.cos(3*t)
-            v = 1.2*np.sin(2*t) 
-            return torus_func(u, v)
+        def base_path(t):
+            return np.stack([1.2*np.cos(3*t), 1.2*np.sin(2*t)], axis=-1)
 
-        torus_path = ParametricFunction(
-            torus_path_func,
+        torus_path = cover.projected_path(
+            base_path,
             t_range=[0, 2*PI],
+            lod=lod,
             stroke_color=RED,
             stroke_width=6
         ).shift(RIGHT * 6, DOWN * 0.6)
 
         # Create multiple plane paths (different fundamental domains)
-        plane_paths = VGroup()
         colors = [RED, GREEN, PURPLE, ORANGE]
         shifts = [(0,0), (1,0), (0,1), (-1,-1)]
-        
-        for i, ((sx, sy), color) in enumerate(zip(shifts, colors)):
-            path = create_plane_path(sx, sy, color)
-            plane_paths.add(path)
+        plane_paths = cover.lifts(
+            base_path,
+            t_range=[0, 2*PI],
+            elements=shifts,
+            chart=plane_chart,
+            colors=colors,
+            lod=lod,
+            stroke_width=4
+        )
 
         # Show all plane paths and the single torus path
         self.play(
@@ -195,80 +185,50 @@ class TorusCover(ThreeDScene):
         )
         self.wait(1)
 
-        # Create intermediate surfaces that morph from rectangle to torus
-        def morphing_surface(alpha):
-            """Create a surface that interpolates between flat rectangle and torus"""
-            def surface_func(u, v):
-                # u and v go from 0 to 2π
-                # For rectangle: just return flat coordinates
-                # For torus: use torus parameterization
-                
-                if alpha == 0:
-                    # Flat rectangle
-                    return np.array([
-                        (u - PI) * 0.8,  # Scale down to fit
-                        (v - PI) * 0.8,
-                        0
-                    ])
-                else:
-                    # Interpolate towards torus
-                    major_radius = 1.5 * alpha
-                    minor_radius = 0.5 * alpha
-                    
-                    # Flat component (decreasing)
-                    flat_x = (1 - alpha) * (u - PI) * 0.8
-                    flat_y = (1 - alpha) * (v - PI) * 0.8
-                    flat_z = 0
-                    
-                    # Torus component (increasing)
-                    torus_x = alpha * (major_radius + minor_radius * np.cos(v)) * np.cos(u)
-                    torus_y = alpha * (major_radius + minor_radius * np.cos(v)) * np.sin(u)
-                    torus_z = alpha * minor_radius * np.sin(v)
-                    
-                    return np.array([
-                        flat_x + torus_x,
-                        flat_y + torus_y, 
-                        flat_z + torus_z
-                    ])
-            
-            return Surface(
-                surface_func,
-                u_range=[0, 2*PI],
-                v_range=[0, 2*PI],
-                resolution=(25, 25),
-                fill_opacity=0.8,
-                fill_color=interpolate_color(YELLOW, BLUE_D, alpha),
-                stroke_color=interpolate_color(YELLOW, BLUE_E, alpha),
-                stroke_width=1
-            ).shift(RIGHT * 6, DOWN * 0.6) 
-
-        # Animate the morphing in steps
-        morphing_steps = [0.2, 0.4, 0.6, 0.8, 1.0]
-        
-        for i, alpha in enumerate(morphing_steps):
-            target_surface = morphing_surface(alpha)
-            
-            if i == 0:
-                # First transformation from rectangle
-                initial_surface = morphing_surface(0)
-                self.play(
-                    Transform(morphing_domain, initial_surface),
-                    run_time=1
-                )
-                self.play(
-                    Transform(morphing_domain, target_surface),
-                    run_time=1.5
-                )
-            else:
-                self.play(
-                    Transform(morphing_domain, target_surface),
-                    run_time=1.5
+        # Sample the flat rectangle and the torus once on a shared grid. The
+        # intermediate surfaces are (1 - alpha) * flat + alpha * (torus with
+        # radii scaled by alpha), i.e. weights (1 - alpha, alpha^2)
+        def flat_func(u, v):
+            return np.array([
+                (u - PI) * 0.8,  # Scale down to fit
+                (v - PI) * 0.8,
+                0 * u
+            ])
+
+        morphing_surface = MorphingSurface(
+            flat_func,
+            torus_func,
+            weights=lambda alpha: (1 - alpha, alpha ** 2),
+            u_range=[0, 2*PI],
+            v_range=[0, 2*PI],
+            resolution=(25, 25),
+            fill_opacity=0.8,
+            fill_color=YELLOW,
+            stroke_color=YELLOW,
+            stroke_width=1
+        ).shift(RIGHT * 6, DOWN * 0.6)
+
+        # First transformation from rectangle
+        self.play(
+            ReplacementTransform(morphing_domain, morphing_surface),
+            run_time=1
+        )
+
+        # Then one continuous morph through all the intermediate surfaces
+        self.play(
+            UpdateFromAlphaFunc(
+                morphing_surface,
+                lambda mob, alpha: mob.set_alpha(alpha).set_stroke(
+                    interpolate_color(YELLOW, BLUE_E, alpha)
                 )
-                
+            ),
+            run_time=7.5
+        )
+
         self.wait(2)
                 
         # Fade it away after 2 seconds
-        self.play(FadeOut(morphing_domain), run_time=1)
+        self.play(FadeOut(morphing_surface), run_time=1)
 
         # Show both the morphed surface and original torus
         comparison_text = Tex("Same topology!").scale(0.8)
@@ -286,28 +246,19 @@ class TorusCover(ThreeDScene):
         self.play(FadeOut(comparison_text))
         
         # Create several points on the fundamental domain and show where they map
-        sample_points_plane = [
-            plane.c2p(PI/2, PI/2),
-            plane.c2p(3*PI/2, PI/2), 
-            plane.c2p(PI/2, 3*PI/2),
-            plane.c2p(3*PI/2, 3*PI/2)
-        ]
+        sample_coords = np.array([(PI/2, PI/2), (3*PI/2, PI/2), (PI/2, 3*PI/2), (3*PI/2, 3*PI/2)])
+        sample_points_plane = plane_chart(sample_coords)
         
         # Corresponding points on torus
-        sample_coords = [(PI/2, PI/2), (3*PI/2, PI/2), (PI/2, 3*PI/2), (3*PI/2, 3*PI/2)]
-        sample_points_torus = []
-        for u, v in sample_coords:
-            point = torus_func(u, v)
-            sample_points_torus.append(point + RIGHT * 6 + DOWN * 0.6)
+        sample_points_torus = cover.project(sample_coords) + RIGHT * 6 + DOWN * 0.6
 
         # Create dots and connecting lines
-        plane_dots = VGroup(*[Dot(point, color=RED, radius=0.08) for point in sample_points_plane])
-        torus_dots = VGroup(*[Dot(point, color=RED, radius=0.08) for point in sample_points_torus])
+        plane_dots = DotCloud(sample_points_plane, color=RED, radius=0.08)
+        torus_dots = DotCloud(sample_points_torus, color=RED, radius=0.08)
         
-        connecting_lines = VGroup()
-        for p_plane, p_torus in zip(sample_points_plane, sample_points_torus):
-            line = DashedLine(p_plane, p_torus, color=WHITE, stroke_width=2)
-            connecting_lines.add(line)
+        connecting_lines = LineSet(
+            sample_points_plane, sample_points_torus, color=WHITE, stroke_width=2, dash_length=DEFAULT_DASH_LENGTH
+        )
 
         covering_demo_text = Tex("Points on plane map to torus\\\\via the covering map").scale(0.6)
         self.add_fixed_in_frame_mobjects(covering_demo_text)
@@ -0,0 +1,179 @@
+"""Time every play of every scene and compare against a stored baseline.
+
+    python benchmark.py                      # all scenes at -ql and -qh
+    python benchmark.py -q l TorusCover      # one scene, low quality only
+    python benchmark.py --save-baseline      # accept the current numbers
+
+Each scene renders in a fresh process with caching disabled, so every
+frame is drawn and encoded; videos go to a temporary folder and the
+production media is left alone (the Tex and mesh caches are shared, so
+their cost is not part of the numbers). For every play and wait the
+benchmark records the wall time, frames and frames per second, the peak
+resident memory so far, and the number of mobjects (whole families) and
+points in the scene after it.
+
+Results are written to media/benchmark_latest.json. Compared with
+media/benchmark_baseline.json, any scene or play that got slower (or a
+scene whose peak memory grew) by more than --threshold is reported and
+the exit status is 1.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rendering import (
+    ANIMATIONS_DIR, MEDIA_DIR, QUALITIES, find_scenes, load_json, load_scene_class, quality_config,
+    wrap_plays, write_json
+)
+
+BASELINE_PATH = MEDIA_DIR / "benchmark_baseline.json"
+LATEST_PATH = MEDIA_DIR / "benchmark_latest.json"
+DEFAULT_QUALITIES = ("l", "h")
+# Plays shorter than this are too noisy to compare on their own
+MIN_COMPARED_SECONDS = 0.2
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def scene_counts(scene):
+    family = [mobject for top in scene.mobjects for mobject in top.get_family()]
+    return len(family), sum(len(mobject.points) for mobject in family)
+
+
+def benchmark_scene(file, scene_name, quality):
+    """Render one scene in this process and return its per-play measurements"""
+    from manim import tempconfig
+
+    settings = quality_config(quality)
+    scene_class = load_scene_class(file, scene_name)
+    plays = []
+
+    def measured(play, scene, *args, **kwargs):
+        start_time = scene.renderer.time
+        start = time.perf_counter()
+        play(scene, *args, **kwargs)
+        wall_time = time.perf_counter() - start
+        frames = round((scene.renderer.time - start_time) * settings["frame_rate"])
+        mobjects, points = scene_counts(scene)
+        plays.append({
+            "index": len(plays),
+            "animations": [type(animation).__name__ for animation in args],
+            "wall_time": round(wall_time, 4),
+            "frames": frames,
+            "fps": round(frames / wall_time, 1) if wall_time > 0 else None,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "mobjects": mobjects,
+            "points": points,
+        })
+
+    with tempfile.TemporaryDirectory() as video_dir, tempconfig({
+        **settings,
+        "disable_caching": True,
+        "media_dir": str(MEDIA_DIR),
+        "video_dir": video_dir,
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+    }):
+        start = time.perf_counter()
+        scene = scene_class()
+        wrap_plays(scene, measured)
+        scene.render()
+        wall_time = time.perf_counter() - start
+
+    frames = sum(play["frames"] for play in plays)
+    return {
+        "file": Path(file).name,
+        "quality": QUALITIES[quality],
+        "wall_time": round(wall_time, 3),
+        "frames": frames,
+        "fps": round(frames / wall_time, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "plays": plays,
+    }
+
+
+def run_worker(file, scene, quality):
+    """benchmark_scene in a fresh interpreter, so memory and module state start clean"""
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        subprocess.run(
+            [sys.executable, __file__, "--worker", str(file), scene, quality, output.name],
+            cwd=ANIMATIONS_DIR, check=True
+        )
+        return json.loads(Path(output.name).read_text())
+
+
+def compare(latest, baseline, threshold):
+    """Messages for every measurement that regressed by more than threshold (a fraction)"""
+    regressions = []
+    for key, result in latest.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for measure in ("wall_time", "peak_rss_mb"):
+            if result[measure] > previous[measure] * (1 + threshold):
+                regressions.append(f"{key}: {measure} {previous[measure]} -> {result[measure]}")
+        if len(result["plays"]) != len(previous["plays"]):
+            # The scene changed shape; per-play numbers no longer line up
+            continue
+        for play, old in zip(result["plays"], previous["plays"]):
+            if old["wall_time"] >= MIN_COMPARED_SECONDS and play["wall_time"] > old["wall_time"] * (1 + threshold):
+                regressions.append(
+                    f"{key} play {play['index']} ({', '.join(play['animations'])}): "
+                    f"{old['wall_time']:.2f}s -> {play['wall_time']:.2f}s"
+                )
+    return regressions
+
+
+def main():
+    if sys.argv[1:2] == ["--worker"]:
+        file, scene, quality, output = sys.argv[2:6]
+        Path(output).write_text(json.dumps(benchmark_scene(file, scene, quality)))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene names (default: all)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, action="append", help="repeatable (default: l and h)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown as a fraction (default 0.10)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    scenes = find_scenes()
+    if args.scenes:
+        scenes = [scene for scene in scenes if scene[1] in args.scenes]
+    latest = {}
+    for quality in args.quality or DEFAULT_QUALITIES:
+        for file, scene in scenes:
+            key = f"{scene}@{QUALITIES[quality]}"
+            latest[key] = result = run_worker(file, scene, quality)
+            print(f"{key}: {result['wall_time']:.1f}s, {result['fps']} fps, "
+                  f"peak {result['peak_rss_mb']:.0f} MB, {len(result['plays'])} plays")
+    write_json(LATEST_PATH, {"finished": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": latest})
+
+    if args.save_baseline:
+        baseline = load_json(args.baseline, {}).get("results", {})
+        write_json(args.baseline, {"saved": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": {**baseline, **latest}})
+        print(f"saved baseline to {args.baseline}")
+        return
+    baseline = load_json(args.baseline)
+    if baseline is None:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    regressions = compare(latest, baseline["results"], args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        raise SystemExit(1)
+    print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+from manim import *
+import numpy as np
+
+from paths import ArcLengthLookup, AdaptiveParametricFunction, adaptive_samples, hermite_path_points
+from surfaces import torus_func
+
+# Covering maps described by a projection and a deck group. Points of the
+# covering space are arrays whose last axis holds the coordinates, e.g.
+# shape (samples, 2) for a path in the plane. A base path is sampled once;
+# deck transformations then act on the whole sampled array at once, so N
+# lifts cost one evaluation and one broadcast.
+
+
+class TranslationGroup:
+    """ℤⁿ acting by integer combinations of period vectors (ℤ on ℝ, ℤ² on ℝ², ...)"""
+
+    def __init__(self, periods):
+        self.periods = np.atleast_2d(np.asarray(periods, dtype=float))
+
+    def elements(self, elements):
+        return np.asarray(elements, dtype=float).reshape(-1, len(self.periods))
+
+    def act(self, points, elements):
+        """points (..., d) under each element, shape (len(elements), ..., d)"""
+        offsets = self.elements(elements) @ self.periods
+        return points[None] + offsets.reshape((-1,) + (1,) * (points.ndim - 1) + offsets.shape[-1:])
+
+
+def linear_chart(coords_to_point, dimension):
+    """Vectorized version of an affine coords -> scene map, e.g. plane.c2p or number_line.n2p"""
+    origin = np.asarray(coords_to_point(*np.zeros(dimension)), dtype=float)
+    basis = np.array([
+        np.asarray(coords_to_point(*np.eye(dimension)[i]), dtype=float) - origin
+        for i in range(dimension)
+    ])
+    return lambda coords: origin + np.asarray(coords, dtype=float) @ basis
+
+
+class LiftedPath(ArcLengthLookup, VMobject):
+    """A path made from already sampled points: the Hermite curve through them
+    when their parameters are given, else smoothed like ParametricFunction's"""
+
+    def __init__(self, points, t_values=None, **kwargs):
+        super().__init__(**kwargs)
+        if t_values is not None:
+            self.set_points(hermite_path_points(t_values, points))
+            return
+        self.set_points_as_corners(points)
+        if len(points) > 2:
+            self.make_smooth()
+
+
+class CoveringMap:
+    """A covering map given by its projection and deck group.
+
+    projection(*coords) maps covering-space coordinates to the base space in
+    scene coordinates; like the parametrizations in surfaces.py it gets one
+    array per coordinate and returns the x, y, z components. base_path(t)
+    in lift and lifts takes an array of parameters and returns covering-space
+    coordinates of shape (len(t), d): it is a lift of a path in the base,
+    and the others are its images under the deck group.
+    """
+
+    def __init__(self, projection, deck_group):
+        self.projection = projection
+        self.deck_group = deck_group
+
+    def project(self, points):
+        points = np.asarray(points, dtype=float)
+        components = self.projection(*np.moveaxis(points, -1, 0))
+        return np.stack(np.broadcast_arrays(*components), axis=-1)
+
+    def fiber(self, point, elements):
+        """The preimages of project(point) given by the deck elements, shape (len(elements), d)"""
+        return self.deck_group.act(np.atleast_1d(np.asarray(point, dtype=float)), elements)
+
+    def sample(self, base_path, t_range, t_step=0.01, lod=None, chart=None):
+        """Parameters and covering-space samples of base_path.
+
+        With a lod the parameters come from adaptive_samples on the path as
+        drawn through chart; otherwise they are the ones ParametricFunction
+        samples with t_step.
+        """
+        def evaluate(t_values):
+            return np.asarray(base_path(t_values), dtype=float).reshape(len(t_values), -1)
+
+        if lod is not None:
+            t_values, _ = adaptive_samples(lambda t: (chart or self.project)(evaluate(t)), t_range, lod)
+        else:
+            t_min, t_max = t_range
+            t_values = np.append(np.arange(t_min, t_max, t_step), t_max)
+        return t_values, evaluate(t_values)
+
+    def lifts(self, base_path, t_range, elements, chart=None, colors=None, t_step=0.01, lod=None, **kwargs):
+        """A VGroup with one LiftedPath per deck element, drawn through chart
+        (covering coordinates -> scene points, e.g. linear_chart(plane.c2p, 2)).
+
+        The deck transformations of the scenes are isometries, so parameters
+        chosen with lod for the first lift suit all of them.
+        """
+        t_values, samples = self.sample(base_path, t_range, t_step, lod, chart)
+        samples = self.deck_group.act(samples, elements)
+        if chart is not None:
+            samples = chart(samples)
+        color = kwargs.pop("stroke_color", WHITE)
+        colors = colors or [color] * len(samples)
+        return VGroup(*[
+            LiftedPath(points, t_values if lod is not None else None, stroke_color=color, **kwargs)
+            for points, color in zip(samples, colors)
+        ])
+
+    def projected_path(self, base_path, t_range, t_step=0.01, lod=None, **kwargs):
+        """The base-space path that all the lifts cover"""
+        if lod is not None:
+            return AdaptiveParametricFunction(
+                lambda t: np.moveaxis(self.project(base_path(t)), -1, 0), t_range, lod=lod, **kwargs
+            )
+        return LiftedPath(self.project(self.sample(base_path, t_range, t_step)[1]), **kwargs)
+
+
+# The coverings in the scenes. Their projections use the parametrizations in
+# surfaces.py, so they land exactly on the surfaces drawn there
+
+def torus_cover(major_radius=1.5, minor_radius=0.5):
+    """ℝ² -> T², deck group ℤ² of translations by 2π"""
+    return CoveringMap(
+        lambda x, y: torus_func(x, y, major_radius, minor_radius),
+        TranslationGroup([[TAU, 0], [0, TAU]])
+    )
+
+
+def cylinder_cover(radius=2, center=ORIGIN):
+    """ℝ² -> S¹ × ℝ, deck group ℤ of translations by 2π along the first axis"""
+    return CoveringMap(
+        lambda x, h: (center[0] + radius * np.cos(x), center[1] + radius * np.sin(x), center[2] + h),
+        TranslationGroup([[TAU, 0]])
+    )
+
+
+def circle_cover(radius=1, center=ORIGIN):
+    """ℝ -> S¹, deck group ℤ of translations by 2π"""
+    return CoveringMap(
+        lambda t: (center[0] + radius * np.cos(t), center[1] + radius * np.sin(t), center[2] + 0 * t),
+        TranslationGroup([[TAU]])
+    )
+
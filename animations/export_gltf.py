@@ -0,0 +1,339 @@
+"""Export the scenes' surfaces and lift paths as binary glTF for the web page.
+
+    python export_gltf.py                 # all models into media/gltf/
+    python export_gltf.py torus cylinder_wrap
+    python export_gltf.py --max-error 0.25 --zoom 2
+
+Each model is one .glb built from the parametrizations the scenes use:
+
+    torus           the torus, its Lissajous loop and the loop's four lifts
+                    on the plane (TorusCover)
+    torus_morph     TorusCover's flat rectangle with the torus as morph
+                    targets and the scene's weight curve as an animation
+    mobius          the Möbius strip and its core circle
+    klein_bottle    the Klein bottle
+    cylinder_wrap   the strip that wraps onto the cylinder as a morph target,
+                    with the helix and its lifts (CoveringR2toCylinder)
+
+Surfaces are sampled where LevelOfDetail puts the faces for a 1080p frame
+(--max-error pixels at --zoom), curves where adaptive_samples puts their
+points. Vertex positions are stored as 16-bit integers, normals as 8-bit
+(KHR_mesh_quantization) and the node transform scales them back. Morph
+targets move both positions and normals; the normal deltas reach ±2, so
+they stay floats. Curves are LINE_STRIP primitives with unlit materials.
+Coordinates are converted from manim's z-up to glTF's y-up; nodes keep the
+scenes' layout.
+"""
+import argparse
+import json
+import struct
+
+import numpy as np
+from manim import BLUE_D, GREEN, ORANGE, ORIGIN, PURPLE, RED, TAU, YELLOW, ManimColor, config
+
+from covering import cylinder_cover, torus_cover
+from paths import adaptive_samples
+from rendering import MEDIA_DIR
+from surfaces import LevelOfDetail, cylinder_wrap_func, evaluate_grid, klein_bottle_func, mobius_func, torus_func
+
+GLTF_DIR = MEDIA_DIR / "gltf"
+
+BYTE, UNSIGNED_BYTE, SHORT, UNSIGNED_SHORT, UNSIGNED_INT, FLOAT = 5120, 5121, 5122, 5123, 5125, 5126
+ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER = 34962, 34963
+TRIANGLES, LINE_STRIP = 4, 3
+QUANTIZED_MAX = 32767
+MORPH_KEYFRAMES = 31
+
+# Layout of the scenes: TorusCover's plane spans 8π in 10 units and sits 4
+# units left, its torus 6 right and 0.6 down; CoveringR2toCylinder's
+# fundamental strip is 2π wide on a plane that spans 6π in 10 units
+TORUS_OFFSET = np.array([6, -0.6, 0])
+PLANE_OFFSET = np.array([-4, 0, 0])
+PLANE_UNIT = 10 / (4 * TAU)
+STRIP_WIDTH = 10 / 3
+
+
+def to_gltf_axes(points):
+    # manim's (x, y, z) with z up is glTF's (x, z, -y) with y up
+    return np.asarray(points, dtype=float)[..., [0, 2, 1]] * [1, 1, -1]
+
+
+def grid_normals(grid):
+    """Unit normals of a sampled surface from its finite differences along u and v"""
+    normals = np.cross(np.gradient(grid, axis=0), np.gradient(grid, axis=1))
+    lengths = np.linalg.norm(normals, axis=-1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+
+def grid_triangles(rows, columns):
+    """Two triangles per face of a rows x columns vertex grid"""
+    corners = np.arange(rows * columns).reshape(rows, columns)[:-1, :-1].ravel()
+    return np.stack([
+        corners, corners + columns, corners + 1,
+        corners + 1, corners + columns, corners + columns + 1,
+    ], axis=1).reshape(-1, 3)
+
+
+class GlbBuilder:
+    """Collects buffers, accessors, meshes and nodes of one glTF asset and writes it as .glb"""
+
+    def __init__(self):
+        self.gltf = {
+            "asset": {"version": "2.0", "generator": "animations/export_gltf.py"},
+            "extensionsUsed": ["KHR_mesh_quantization"],
+            "extensionsRequired": ["KHR_mesh_quantization"],
+            "scene": 0, "scenes": [{"nodes": []}],
+            "nodes": [], "meshes": [], "materials": [], "accessors": [], "bufferViews": [], "buffers": [],
+        }
+        self.binary = bytearray()
+
+    def _append(self, key, item):
+        self.gltf.setdefault(key, []).append(item)
+        return len(self.gltf[key]) - 1
+
+    def view(self, data, target=None, stride=None):
+        self.binary.extend(b"\0" * (-len(self.binary) % 4))
+        view = {"buffer": 0, "byteOffset": len(self.binary), "byteLength": len(data)}
+        if target is not None:
+            view["target"] = target
+        if stride is not None:
+            view["byteStride"] = stride
+        self.binary.extend(data)
+        return self._append("bufferViews", view)
+
+    def accessor(self, values, component_type, kind, target=ARRAY_BUFFER, normalized=False, bounds=False):
+        """Accessor over values, shape (count, components); vertex attributes are
+        padded to 4-byte strides as glTF requires"""
+        dtype = {BYTE: np.int8, UNSIGNED_BYTE: np.uint8, SHORT: np.int16, UNSIGNED_SHORT: np.uint16,
+                 UNSIGNED_INT: np.uint32, FLOAT: np.float32}[component_type]
+        values = np.asarray(values).astype(dtype).reshape(len(values), -1)
+        stride = None
+        if target == ARRAY_BUFFER:
+            padding = -values.shape[1] * values.itemsize % 4
+            if padding:
+                values = np.pad(values, ((0, 0), (0, padding // values.itemsize)))
+                stride = values.shape[1] * values.itemsize
+        accessor = {
+            "bufferView": self.view(values.tobytes(), target, stride),
+            "componentType": component_type, "count": len(values), "type": kind,
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if bounds:
+            components = {"SCALAR": 1, "VEC3": 3}[kind]
+            accessor["min"] = values[:, :components].min(axis=0).tolist()
+            accessor["max"] = values[:, :components].max(axis=0).tolist()
+        return self._append("accessors", accessor)
+
+    def material(self, color, opacity=1, unlit=False):
+        material = {
+            "pbrMetallicRoughness": {
+                "baseColorFactor": [*ManimColor(color).to_rgb().tolist(), opacity],
+                "metallicFactor": 0, "roughnessFactor": 0.8,
+            },
+            "doubleSided": True,
+        }
+        if opacity < 1:
+            material["alphaMode"] = "BLEND"
+        if unlit:
+            material["extensions"] = {"KHR_materials_unlit": {}}
+            if "KHR_materials_unlit" not in self.gltf["extensionsUsed"]:
+                self.gltf["extensionsUsed"].append("KHR_materials_unlit")
+        return self._append("materials", material)
+
+    def node(self, name, mesh, center, scale, offset=ORIGIN):
+        """Node that turns the mesh's integer positions back into scene coordinates"""
+        index = self._append("nodes", {
+            "name": name, "mesh": mesh,
+            "translation": (center + to_gltf_axes(offset)).tolist(), "scale": [scale] * 3,
+        })
+        self.gltf["scenes"][0]["nodes"].append(index)
+        return index
+
+    def animate_weights(self, name, node, times, weights):
+        sampler = {
+            "input": self.accessor(times, FLOAT, "SCALAR", target=None, bounds=True),
+            "output": self.accessor(np.ravel(weights), FLOAT, "SCALAR", target=None),
+            "interpolation": "LINEAR",
+        }
+        self._append("animations", {
+            "name": name, "samplers": [sampler],
+            "channels": [{"sampler": 0, "target": {"node": node, "path": "weights"}}],
+        })
+
+    def glb(self):
+        self.binary.extend(b"\0" * (-len(self.binary) % 4))
+        self.gltf["buffers"] = [{"byteLength": len(self.binary)}]
+        document = json.dumps(
+            {key: value for key, value in self.gltf.items() if value != []}, separators=(",", ":")
+        ).encode()
+        document += b" " * (-len(document) % 4)
+        length = 12 + 8 + len(document) + 8 + len(self.binary)
+        return b"".join([
+            struct.pack("<4sII", b"glTF", 2, length),
+            struct.pack("<I4s", len(document), b"JSON"), document,
+            struct.pack("<I4s", len(self.binary), b"BIN\0"), bytes(self.binary),
+        ])
+
+
+def quantization(*arrays):
+    """Center and scale that map the positions in arrays[0] and the morph
+    deltas in arrays[1:] to integers within ±QUANTIZED_MAX"""
+    positions = arrays[0].reshape(-1, 3)
+    center = (positions.min(axis=0) + positions.max(axis=0)) / 2
+    extent = max(np.abs(array).max() for array in [positions - center, *arrays[1:]])
+    return center, max(extent, 1e-9) / QUANTIZED_MAX
+
+
+def add_surface(builder, name, funcs, u_range, v_range, lod, color, opacity=1, offset=ORIGIN):
+    """A surface mesh; funcs after the first become morph targets (their
+    differences from the first); returns its node"""
+    u_values, v_values = lod.sample_values(funcs, u_range, v_range)
+    grids = [to_gltf_axes(evaluate_grid(func, u_values, v_values)) for func in funcs]
+    base, targets = grids[0], [grid - grids[0] for grid in grids[1:]]
+    normals = [grid_normals(grid) for grid in grids]
+    center, scale = quantization(base, *targets)
+    attributes = {
+        "POSITION": builder.accessor(np.round((base - center) / scale).reshape(-1, 3), SHORT, "VEC3", bounds=True),
+        "NORMAL": builder.accessor(np.round(normals[0] * 127).reshape(-1, 3), BYTE, "VEC3", normalized=True),
+    }
+    indices = grid_triangles(len(u_values), len(v_values)).ravel()
+    primitive = {
+        "attributes": attributes,
+        "indices": builder.accessor(
+            indices, UNSIGNED_SHORT if indices.max() < 65535 else UNSIGNED_INT, "SCALAR",
+            target=ELEMENT_ARRAY_BUFFER
+        ),
+        "material": builder.material(color, opacity),
+        "mode": TRIANGLES,
+    }
+    mesh = {"name": name, "primitives": [primitive]}
+    if targets:
+        primitive["targets"] = [
+            {
+                "POSITION": builder.accessor(np.round(target / scale).reshape(-1, 3), SHORT, "VEC3", bounds=True),
+                "NORMAL": builder.accessor((normal - normals[0]).reshape(-1, 3), FLOAT, "VEC3"),
+            }
+            for target, normal in zip(targets, normals[1:])
+        ]
+        mesh["weights"] = [0] * len(targets)
+    return builder.node(name, builder._append("meshes", mesh), center, scale, offset)
+
+
+def add_curves(builder, name, curves, colors, offset=ORIGIN):
+    """Polylines, one LINE_STRIP primitive each, sharing one quantized node"""
+    curves = [to_gltf_axes(curve) for curve in curves]
+    center, scale = quantization(np.concatenate(curves))
+    primitives = [
+        {
+            "attributes": {"POSITION": builder.accessor(np.round((curve - center) / scale), SHORT, "VEC3", bounds=True)},
+            "material": builder.material(color, unlit=True),
+            "mode": LINE_STRIP,
+        }
+        for curve, color in zip(curves, colors)
+    ]
+    builder.node(name, builder._append("meshes", {"name": name, "primitives": primitives}), center, scale, offset)
+
+
+def lissajous(t):
+    # TorusCover's loop in the fundamental domain
+    return np.stack([1.2 * np.cos(3 * t), 1.2 * np.sin(2 * t)], axis=-1)
+
+
+def flat_rectangle(u, v):
+    # TorusCover's morphing_surface at alpha = 0
+    return np.array([(u - np.pi) * 0.8, (v - np.pi) * 0.8, 0 * u])
+
+
+def export_torus(builder, lod):
+    add_surface(builder, "torus", [torus_func], [0, TAU], [0, TAU], lod, BLUE_D, 0.7, TORUS_OFFSET)
+    cover = torus_cover()
+    _, image = adaptive_samples(lambda t: cover.project(lissajous(t)), [0, TAU], lod)
+    add_curves(builder, "torus path", [image], [RED], TORUS_OFFSET)
+
+    def plane_chart(coords):
+        return np.concatenate([coords * PLANE_UNIT, np.zeros(coords.shape[:-1] + (1,))], axis=-1)
+
+    _, samples = cover.sample(lissajous, [0, TAU], lod=lod, chart=plane_chart)
+    lifts = plane_chart(cover.deck_group.act(samples, [(0, 0), (1, 0), (0, 1), (-1, -1)]))
+    add_curves(builder, "plane lifts", list(lifts), [RED, GREEN, PURPLE, ORANGE], PLANE_OFFSET)
+
+
+def export_torus_morph(builder, lod):
+    # The scene blends (1 - alpha) * flat + alpha^2 * torus, which is not
+    # linear in alpha. With the targets (point - flat) and (torus - flat)
+    # weighted alpha - alpha^2 and alpha^2 the blend is exact
+    node = add_surface(
+        builder, "torus morph", [flat_rectangle, lambda u, v: 0 * flat_rectangle(u, v), torus_func],
+        [0, TAU], [0, TAU], lod, YELLOW, 0.8, TORUS_OFFSET
+    )
+    alpha = np.linspace(0, 1, MORPH_KEYFRAMES)
+    builder.animate_weights(
+        "rectangle to torus", node, alpha * 7.5, np.stack([alpha - alpha ** 2, alpha ** 2], axis=1)
+    )
+
+
+def export_mobius(builder, lod):
+    add_surface(builder, "mobius", [mobius_func], [0, TAU], [-1, 1], lod, BLUE_D, 0.7)
+    _, core = adaptive_samples(lambda t: np.stack(mobius_func(t, 0 * t), axis=-1), [0, TAU], lod)
+    add_curves(builder, "core circle", [core], [YELLOW])
+
+
+def export_klein_bottle(builder, lod):
+    add_surface(builder, "klein bottle", [klein_bottle_func], [0, 1], [0, 1], lod, BLUE_D, 0.7)
+
+
+def export_cylinder_wrap(builder, lod):
+    node = add_surface(
+        builder, "cylinder wrap",
+        [lambda u, v: cylinder_wrap_func(u, v, 0, STRIP_WIDTH), lambda u, v: cylinder_wrap_func(u, v, 1, STRIP_WIDTH)],
+        [0, TAU], [-3, 3], lod, BLUE_D, 0.6
+    )
+    alpha = np.linspace(0, 1, MORPH_KEYFRAMES)
+    builder.animate_weights("plane to cylinder", node, alpha * 4, alpha[:, None])
+    # The helix and its lifts to the next strips all project to the same curve
+    cover = cylinder_cover(radius=2)
+    helix = lambda t: np.stack([t, -3 + 6 * t / (2 * TAU)], axis=-1)
+    _, samples = cover.sample(helix, [0, 2 * TAU], lod=lod)
+    lifts = cover.project(cover.deck_group.act(samples, [0, 1, 2, 3]))
+    add_curves(builder, "helix lifts", list(lifts), [YELLOW, GREEN, RED, PURPLE])
+
+
+MODELS = {
+    "torus": export_torus,
+    "torus_morph": export_torus_morph,
+    "mobius": export_mobius,
+    "klein_bottle": export_klein_bottle,
+    "cylinder_wrap": export_cylinder_wrap,
+}
+
+
+def export_model(name, lod):
+    builder = GlbBuilder()
+    MODELS[name](builder, lod)
+    path = GLTF_DIR / f"{name}.glb"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(builder.glb())
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("models", nargs="*", help=f"any of {', '.join(MODELS)} (default: all)")
+    parser.add_argument("--max-error", type=float, default=0.5, help="pixels at 1080p (default 0.5)")
+    parser.add_argument("--zoom", type=float, default=1, help="largest zoom the page shows (default 1)")
+    args = parser.parse_args()
+    unknown = set(args.models) - set(MODELS)
+    if unknown:
+        parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+
+    lod = LevelOfDetail(
+        zoom=args.zoom, pixel_width=1920, frame_width=config.frame_width, max_error=args.max_error
+    )
+    for name in args.models or MODELS:
+        path = export_model(name, lod)
+        print(f"{path.name:<20}{path.stat().st_size / 1024:>8.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
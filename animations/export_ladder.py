@@ -0,0 +1,171 @@
+"""Export the rendered scenes as a ladder of web renditions.
+
+    python render_all.py -q h     # masters in media/videos/<file>/1080p60
+    python export_ladder.py       # all scenes
+    python export_ladder.py TorusCover
+
+For every scene the 1080p60 master is transcoded into media/streaming/<Scene>/:
+
+- <Scene>_<rung>.mp4    H.264, faststart, one per rung of LADDER
+- <Scene>_<rung>.webm   AV1 in WebM (needs an ffmpeg with libsvtav1 or libaom)
+- hls/master.m3u8       HLS with one variant per H.264 rung, fMP4 segments
+- dash/manifest.mpd     DASH over the same H.264 renditions
+- <Scene>_poster.jpg    shown before the first frame arrives
+
+Keyframes are placed every two seconds in every rendition so the HLS and
+DASH segments of all rungs line up. media/streaming/report.json lists the
+size and average bitrate of each rendition; simulations/covering-spaces.html
+embeds these files.
+"""
+import argparse
+import shutil
+import subprocess
+import time
+
+from rendering import ANIMATIONS_DIR, MEDIA_DIR, find_scenes, load_json, video_duration, video_path, write_json
+
+STREAMING_DIR = MEDIA_DIR / "streaming"
+REPORT_PATH = STREAMING_DIR / "report.json"
+
+# name, height, frame rate, H.264 peak bitrate (kbit/s), AV1 CRF
+LADDER = [
+    ("480p30", 480, 30, 900, 40),
+    ("720p30", 720, 30, 1800, 36),
+    ("1080p60", 1080, 60, 4500, 32),
+]
+KEYFRAME_SECONDS = 2
+SEGMENT_SECONDS = 4
+POSTER_TIME = 3
+
+
+def ffmpeg(*args):
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", *map(str, args)], check=True)
+
+
+def av1_encoder():
+    """Arguments for the best AV1 encoder this ffmpeg has, or None"""
+    encoders = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"], capture_output=True, text=True).stdout
+    if "libsvtav1" in encoders:
+        return lambda crf: ["-c:v", "libsvtav1", "-preset", "6", "-crf", crf]
+    if "libaom-av1" in encoders:
+        return lambda crf: ["-c:v", "libaom-av1", "-cpu-used", "6", "-row-mt", "1", "-crf", crf, "-b:v", "0"]
+    return None
+
+
+def encode_rung(master, output_dir, scene, rung, av1):
+    name, height, fps, max_kbps, av1_crf = rung
+    common = [
+        "-i", master, "-an", "-vf", f"scale=-2:{height}:flags=lanczos,fps={fps}", "-pix_fmt", "yuv420p",
+        "-g", fps * KEYFRAME_SECONDS, "-keyint_min", fps * KEYFRAME_SECONDS,
+    ]
+    outputs = [output_dir / f"{scene}_{name}.mp4"]
+    ffmpeg(
+        *common, "-c:v", "libx264", "-preset", "slow", "-profile:v", "high", "-crf", "22",
+        "-maxrate", f"{max_kbps}k", "-bufsize", f"{2 * max_kbps}k", "-sc_threshold", "0",
+        "-movflags", "+faststart", outputs[0]
+    )
+    if av1 is not None:
+        outputs.append(output_dir / f"{scene}_{name}.webm")
+        ffmpeg(*common, *av1(av1_crf), outputs[1])
+    return outputs
+
+
+def package_hls(renditions, output_dir):
+    hls_dir = output_dir / "hls"
+    shutil.rmtree(hls_dir, ignore_errors=True)
+    hls_dir.mkdir(parents=True)
+    inputs = [arg for path in renditions for arg in ("-i", path)]
+    maps = [arg for index in range(len(renditions)) for arg in ("-map", f"{index}:v")]
+    stream_map = " ".join(f"v:{index},name:{rung[0]}" for index, rung in enumerate(LADDER))
+    ffmpeg(
+        *inputs, *maps, "-c", "copy", "-f", "hls", "-hls_time", SEGMENT_SECONDS,
+        "-hls_playlist_type", "vod", "-hls_segment_type", "fmp4",
+        "-hls_segment_filename", hls_dir / "%v" / "segment_%03d.m4s",
+        "-master_pl_name", "master.m3u8", "-var_stream_map", stream_map, hls_dir / "%v" / "index.m3u8"
+    )
+    return hls_dir
+
+
+def package_dash(renditions, output_dir):
+    dash_dir = output_dir / "dash"
+    shutil.rmtree(dash_dir, ignore_errors=True)
+    dash_dir.mkdir(parents=True)
+    inputs = [arg for path in renditions for arg in ("-i", path)]
+    maps = [arg for index in range(len(renditions)) for arg in ("-map", f"{index}:v")]
+    ffmpeg(
+        *inputs, *maps, "-c", "copy", "-f", "dash", "-seg_duration", SEGMENT_SECONDS,
+        "-use_template", "1", "-use_timeline", "1", "-adaptation_sets", "id=0,streams=v",
+        "-init_seg_name", "init_$RepresentationID$.m4s",
+        "-media_seg_name", "chunk_$RepresentationID$_$Number%05d$.m4s", dash_dir / "manifest.mpd"
+    )
+    return dash_dir
+
+
+def export_scene(file, scene, av1):
+    master = video_path(file, scene, "h")
+    if not master.exists():
+        raise FileNotFoundError(f"{master.relative_to(ANIMATIONS_DIR)} is missing; render it with render_all.py -q h")
+    output_dir = STREAMING_DIR / scene
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    renditions = {rung[0]: encode_rung(master, output_dir, scene, rung, av1) for rung in LADDER}
+    h264 = [outputs[0] for outputs in renditions.values()]
+    hls_dir = package_hls(h264, output_dir)
+    dash_dir = package_dash(h264, output_dir)
+    poster = output_dir / f"{scene}_poster.jpg"
+    ffmpeg("-ss", POSTER_TIME, "-i", master, "-frames:v", 1, "-vf", "scale=-2:720", "-q:v", 4, poster)
+
+    duration = video_duration(master)
+    report = {"master": {"path": str(master.relative_to(ANIMATIONS_DIR)), "bytes": master.stat().st_size}}
+    for name, outputs in renditions.items():
+        for path in outputs:
+            size = path.stat().st_size
+            report[path.name] = {
+                "rung": name,
+                "codec": "h264" if path.suffix == ".mp4" else "av1",
+                "bytes": size,
+                "kbps": round(size * 8 / duration / 1000) if duration else None,
+            }
+    for directory in (hls_dir, dash_dir):
+        report[directory.name] = {"bytes": sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())}
+    report[poster.name] = {"bytes": poster.stat().st_size}
+    report["duration"] = duration
+    return report
+
+
+def print_report(reports):
+    print(f"{'rendition':<40}{'codec':>7}{'size':>10}{'kbit/s':>9}")
+    for scene, report in reports.items():
+        for name, entry in report.items():
+            if isinstance(entry, dict):
+                kbps = entry.get("kbps")
+                print(f"{scene + '/' + name:<40}{entry.get('codec', ''):>7}"
+                      f"{entry['bytes'] / 1024 ** 2:>8.1f}MB{'' if kbps is None else kbps:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene names (default: all)")
+    args = parser.parse_args()
+    if shutil.which("ffmpeg") is None:
+        raise SystemExit("export_ladder.py needs ffmpeg on PATH")
+
+    scenes = find_scenes()
+    if args.scenes:
+        scenes = [scene for scene in scenes if scene[1] in args.scenes]
+    av1 = av1_encoder()
+    if av1 is None:
+        print("this ffmpeg has no AV1 encoder; skipping the .webm renditions")
+
+    reports = {}
+    for file, scene in scenes:
+        start = time.perf_counter()
+        reports[scene] = export_scene(file, scene, av1)
+        print(f"{scene}: exported in {time.perf_counter() - start:.1f}s")
+    previous = load_json(REPORT_PATH, {}).get("scenes", {})
+    write_json(REPORT_PATH, {"finished": time.strftime("%Y-%m-%dT%H:%M:%S"), "scenes": {**previous, **reports}})
+    print_report(reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from manim import *
+import numpy as np
+
+
+def rotations_from_out(directions):
+    """Rotation matrices taking OUT to each of the given unit directions, shape (n, 3, 3)"""
+    directions = np.asarray(directions, dtype=float).reshape(-1, 3)
+    # Rodrigues' formula for the rotation about OUT x d by the angle between them
+    cos = directions[:, 2]
+    axis = np.cross(OUT, directions)
+    cross_matrix = np.zeros((len(directions), 3, 3))
+    cross_matrix[:, 0, 1], cross_matrix[:, 0, 2] = -axis[:, 2], axis[:, 1]
+    cross_matrix[:, 1, 0], cross_matrix[:, 1, 2] = axis[:, 2], -axis[:, 0]
+    cross_matrix[:, 2, 0], cross_matrix[:, 2, 1] = -axis[:, 1], axis[:, 0]
+    anti_parallel = cos < -1 + 1e-9
+    scale = 1 / np.where(anti_parallel, 1, 1 + cos)
+    rotations = np.identity(3) + cross_matrix + scale[:, None, None] * (cross_matrix @ cross_matrix)
+    # Pointing straight IN: half turn about the x-axis
+    rotations[anti_parallel] = np.diag([1.0, -1.0, -1.0])
+    return rotations
+
+
+class VectorGlyph(VGroup):
+    """An Arrow3D that is built once and then only repositioned.
+
+    An Arrow3D along OUT with a shaft of length 1, whatever the tip height,
+    is tessellated when the glyph is created. Moving the glyph to new start
+    and end points rewrites the points of its shaft and cone from that
+    reference with one matrix product: the shaft is
+    stretched along its axis, the cone keeps its size (it shrinks only when
+    the vector gets shorter than the cone), and both are rotated by the
+    orientation matrix and shifted to start.
+    """
+
+    def __init__(self, start=LEFT, end=RIGHT, height=0.3, **kwargs):
+        if height <= 0:
+            raise ValueError(f"tip height must be positive, got {height}")
+        super().__init__()
+        self.tip_height = height
+        self._reference_length = 1 + height
+        reference = Arrow3D(start=ORIGIN, end=self._reference_length * OUT, height=height, **kwargs)
+        tip_members = set(reference.cone.family_members_with_points())
+        self.add(*reference.submobjects)
+        # Arrow3D's end marker is placed at the end directly, not stretched with the shaft
+        self.end_point = reference.end_point
+        self._members = [mob for mob in self.family_members_with_points() if mob is not self.end_point]
+        self._reference = np.concatenate([mob.points for mob in self._members])
+        self._is_tip = np.concatenate([
+            np.full(len(mob.points), mob in tip_members) for mob in self._members
+        ])
+        self._splits = np.cumsum([len(mob.points) for mob in self._members])[:-1]
+        # Measured, so the stretch matches the shaft Arrow3D actually built
+        self._shaft_length = np.ptp(self._reference[~self._is_tip, 2])
+        self.orientation = np.identity(3)
+        self.put_start_and_end_on(start, end)
+
+    def get_start(self):
+        return self.start
+
+    def get_end(self):
+        return self.end
+
+    def put_start_and_end_on(self, start, end):
+        start, end = np.array(start, dtype=float), np.array(end, dtype=float)
+        length = np.linalg.norm(end - start)
+        # A zero vector has no direction, so keep the previous orientation
+        orientation = self.orientation
+        if length > 0:
+            orientation = rotations_from_out((end - start) / length)[0]
+        return self.set_frame(start, orientation, length)
+
+    def set_frame(self, start, orientation, length):
+        """Place the glyph at start, pointing along orientation @ OUT, with the given length"""
+        self.start = np.array(start, dtype=float)
+        self.orientation = np.array(orientation, dtype=float)
+        self.length = length
+        self.end = self.start + length * self.orientation[:, 2]
+
+        h = self.tip_height
+        tip_scale = min(1, length / h)
+        local = self._reference.copy()
+        shaft, tip = ~self._is_tip, self._is_tip
+        local[shaft, 2] *= max(length - h, 0) / self._shaft_length
+        local[tip, :2] *= tip_scale
+        local[tip, 2] = length - tip_scale * (self._reference_length - local[tip, 2])
+
+        world = local @ self.orientation.T + self.start
+        for mob, points in zip(self._members, np.split(world, self._splits)):
+            mob.points[...] = points
+        self.end_point.set_location(self.end)
+        return self
+
@@ -0,0 +1,201 @@
+"""Check that changes to the scenes or helpers leave the rendered frames unchanged.
+
+    python golden_frames.py record              # store golden frames for all scenes
+    python golden_frames.py check               # compare against them
+    python golden_frames.py check TorusCover
+
+Scenes are rendered in this process at 256x144, 15 fps, with a fixed random
+seed, caching disabled and no video written, so a check needs neither
+ffmpeg nor the network. The frame halfway through every play and the
+frame at its end are kept.
+
+golden/<Scene>.json stores, per frame, a SHA-256 of the pixels, a 256-bit
+difference hash (dHash) and two tolerances; golden/<Scene>/ holds the
+frames as PNG. A frame passes when its pixels are identical, or when its
+dHash differs from the golden one in at most `tolerance` bits and at most
+a `pixel_tolerance` fraction of its pixels changed visibly. The dHash
+catches layout changes, the pixel count small local ones that a
+thumbnail hash cannot see. Raise the tolerances of a single frame in the
+JSON where antialiasing noise is expected. For each failing frame,
+media/golden_diffs/<Scene>/ gets an image of golden | new | amplified
+difference.
+"""
+import argparse
+import hashlib
+import random
+import time
+
+import numpy as np
+from PIL import Image
+
+from rendering import ANIMATIONS_DIR, MEDIA_DIR, find_scenes, load_json, load_scene_class, wrap_plays, write_json
+
+GOLDEN_DIR = ANIMATIONS_DIR / "golden"
+DIFF_DIR = MEDIA_DIR / "golden_diffs"
+RENDER_CONFIG = {
+    "pixel_width": 256,
+    "pixel_height": 144,
+    "frame_rate": 15,
+    "disable_caching": True,
+    "write_to_movie": False,
+    "save_last_frame": False,
+    "progress_bar": "none",
+    "verbosity": "WARNING",
+}
+DEFAULT_TOLERANCE = 4  # bits of the 256-bit dHash
+DEFAULT_PIXEL_TOLERANCE = 0.001  # fraction of pixels
+VISIBLE_DIFFERENCE = 24  # per channel, out of 255
+HASH_SIZE = 16
+SEED = 0
+
+
+def difference_hash(frame):
+    """dHash: is each cell of a 16x17 grayscale thumbnail brighter than its right neighbour"""
+    gray = np.asarray(Image.fromarray(frame).convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR), dtype=float)
+    bits = (gray[:, 1:] > gray[:, :-1]).ravel()
+    return np.packbits(bits).tobytes().hex()
+
+
+def hash_distance(first, second):
+    return int(np.unpackbits(np.frombuffer(bytes.fromhex(first), np.uint8) ^ np.frombuffer(bytes.fromhex(second), np.uint8)).sum())
+
+
+def checksum(frame):
+    return hashlib.sha256(np.ascontiguousarray(frame).tobytes()).hexdigest()
+
+
+def render_frames(file, scene_name):
+    """{frame name: RGB array} for the middle and end of every play"""
+    from manim import tempconfig
+
+    scene_class = load_scene_class(file, scene_name)
+    frames = {}
+    plays = []
+
+    def captured(play, scene, *args, **kwargs):
+        index = len(plays)
+        plays.append(index)
+        renderer = scene.renderer
+        start, add_frame = renderer.time, renderer.add_frame
+
+        def add_frame_at_middle(frame, *frame_args, **frame_kwargs):
+            halfway = start + getattr(scene, "duration", 0) / 2
+            if f"play{index:03}_mid" not in frames and renderer.time >= halfway:
+                frames[f"play{index:03}_mid"] = np.array(frame[..., :3])
+            return add_frame(frame, *frame_args, **frame_kwargs)
+
+        renderer.add_frame = add_frame_at_middle
+        try:
+            play(scene, *args, **kwargs)
+        finally:
+            renderer.add_frame = add_frame
+        frames[f"play{index:03}_end"] = np.array(renderer.get_frame()[..., :3])
+
+    random.seed(SEED)
+    np.random.seed(SEED)
+    with tempconfig({**RENDER_CONFIG, "media_dir": str(MEDIA_DIR)}):
+        scene = scene_class(random_seed=SEED)
+        wrap_plays(scene, captured)
+        scene.render()
+    return frames
+
+
+def record(file, scene):
+    frames = render_frames(file, scene)
+    frame_dir = GOLDEN_DIR / scene
+    frame_dir.mkdir(parents=True, exist_ok=True)
+    for stale in frame_dir.glob("*.png"):
+        stale.unlink()
+    previous = load_json(GOLDEN_DIR / f"{scene}.json", {}).get("frames", {})
+    entries = {}
+    for name, frame in frames.items():
+        Image.fromarray(frame).save(frame_dir / f"{name}.png", optimize=True)
+        entries[name] = {
+            "sha256": checksum(frame),
+            "dhash": difference_hash(frame),
+            # Tolerances loosened by hand survive re-recording
+            "tolerance": previous.get(name, {}).get("tolerance", DEFAULT_TOLERANCE),
+            "pixel_tolerance": previous.get(name, {}).get("pixel_tolerance", DEFAULT_PIXEL_TOLERANCE),
+        }
+    write_json(GOLDEN_DIR / f"{scene}.json", {
+        "scene": scene, "file": file.name, "config": RENDER_CONFIG,
+        "recorded": time.strftime("%Y-%m-%dT%H:%M:%S"), "frames": entries,
+    })
+    print(f"{scene}: recorded {len(entries)} frames")
+
+
+def changed_fraction(golden, frame):
+    if golden.shape != frame.shape:
+        return 1.0
+    return float((np.abs(golden.astype(int) - frame.astype(int)).max(axis=-1) > VISIBLE_DIFFERENCE).mean())
+
+
+def write_diff(scene, name, golden, frame):
+    if golden.shape != frame.shape:
+        frame = np.asarray(Image.fromarray(frame).resize(golden.shape[1::-1]))
+    difference = np.abs(golden.astype(int) - frame.astype(int))
+    amplified = np.clip(difference * 8, 0, 255).astype(np.uint8)
+    path = DIFF_DIR / scene / f"{name}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(np.concatenate([golden, frame, amplified], axis=1)).save(path)
+    return path
+
+
+def check(file, scene):
+    """Messages for every frame that no longer matches, or None without golden data"""
+    golden = load_json(GOLDEN_DIR / f"{scene}.json")
+    if golden is None:
+        return None
+    frames = render_frames(file, scene)
+    failures = []
+    if set(golden["frames"]) != set(frames):
+        failures.append(f"{scene}: frames differ in number ({len(golden['frames'])} golden, {len(frames)} now)")
+    for name, expected in golden["frames"].items():
+        frame = frames.get(name)
+        if frame is None or checksum(frame) == expected["sha256"]:
+            continue
+        distance = hash_distance(difference_hash(frame), expected["dhash"])
+        golden_frame = np.asarray(Image.open(GOLDEN_DIR / scene / f"{name}.png").convert("RGB"))
+        changed = changed_fraction(golden_frame, frame)
+        if distance <= expected["tolerance"] and changed <= expected["pixel_tolerance"]:
+            continue
+        diff_path = write_diff(scene, name, golden_frame, frame)
+        failures.append(
+            f"{scene} {name}: dHash distance {distance} (tolerance {expected['tolerance']}), "
+            f"{changed:.2%} of pixels changed (tolerance {expected['pixel_tolerance']:.2%}), "
+            f"see {diff_path.relative_to(ANIMATIONS_DIR)}"
+        )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("record", "check"))
+    parser.add_argument("scenes", nargs="*", help="scene names (default: all)")
+    args = parser.parse_args()
+
+    scenes = find_scenes()
+    if args.scenes:
+        scenes = [scene for scene in scenes if scene[1] in args.scenes]
+    if args.command == "record":
+        for file, scene in scenes:
+            record(file, scene)
+        return
+
+    failures = []
+    for file, scene in scenes:
+        start = time.perf_counter()
+        result = check(file, scene)
+        if result is None:
+            print(f"{scene}: no golden frames, run `golden_frames.py record {scene}`")
+            continue
+        failures += result
+        print(f"{scene}: {'ok' if not result else f'{len(result)} failures'} ({time.perf_counter() - start:.1f}s)")
+    for message in failures:
+        print(f"FAIL {message}")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
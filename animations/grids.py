@@ -0,0 +1,102 @@
+from manim import *
+import numpy as np
+
+from covering import linear_chart
+from instanced import LineSet
+
+
+class CompactNumberPlane(NumberPlane):
+    """A NumberPlane whose background lines are one LineSet.
+
+    NumberPlane builds every grid line as a Line of its own; here they are
+    the subpaths of a single VMobject (two with faded lines), computed in
+    one go from the axes, so the grid is cheap to build, copy, style and
+    rasterize. Lines sit where NumberPlane puts them and are split into
+    main and faded lines the same way; coordinates, axes and c2p work as
+    usual.
+    """
+
+    def _init_background_lines(self):
+        if self.faded_line_style is None:
+            # NumberPlane's default: the background style at half strength
+            self.faded_line_style = {
+                key: value * 0.5 if isinstance(value, (int, float)) else value
+                for key, value in self.background_line_style.items()
+            }
+        main, faded = [], []
+        for axis, other_axis in [(1, 0), (0, 1)]:
+            values, is_main = self._line_values(self.axes[axis], self.axes[other_axis])
+            low, high = self.axes[other_axis].x_range[:2]
+            # Coordinates of both ends of each line, with the line's value on axis
+            ends = np.zeros((len(values), 2, 2))
+            ends[:, :, axis] = values[:, None]
+            ends[:, :, other_axis] = [low, high]
+            main.append(ends[is_main])
+            faded.append(ends[~is_main])
+        self.background_lines = self._line_set(np.concatenate(main), self.background_line_style)
+        self.faded_lines = self._line_set(np.concatenate(faded), self.faded_line_style)
+        self.add_to_back(self.faded_lines, self.background_lines)
+
+    def _line_values(self, axis, parallel_axis):
+        # Coordinates on axis of the lines parallel to parallel_axis, with the
+        # ranges and main/faded split of NumberPlane._get_lines_parallel_to_axis
+        # (manim 0.18.1): steps of step / ratio from the parallel axis outwards,
+        # where the k-th line on each side counts from the first line off the
+        # axis, so with ratio > 1 the main lines are k * ratio + 1 steps out
+        ratio = self.faded_line_ratio or 1
+        step = axis.x_range[2] / ratio
+        x_min, x_max = axis.x_range[:2]
+        if axis.x_min > 0 and x_min < 0:
+            x_min, x_max = 0, np.abs(x_min) + np.abs(x_max)
+        ranges = (
+            np.array([0.0]),
+            np.arange(step, min(x_max - x_min, x_max), step),
+            np.arange(-step, max(x_min - x_max, x_min), -step),
+        )
+        # Lines are shifted from the parallel axis, wherever it crosses this one
+        offset = axis.p2n(parallel_axis.get_start())
+        values = offset + np.concatenate(ranges)
+        is_main = np.concatenate([np.arange(len(inputs)) % ratio == 0 for inputs in ranges])
+        return values, is_main
+
+    def _line_set(self, ends, style):
+        points = linear_chart(self.c2p, 2)(ends)
+        return LineSet(
+            points[:, 0], points[:, 1],
+            color=style.get("stroke_color", BLUE_D),
+            stroke_width=style.get("stroke_width", 2),
+            stroke_opacity=style.get("stroke_opacity", 1)
+        )
+
+
+_PLANES = {}
+
+
+def compact_plane(**kwargs):
+    """A CompactNumberPlane, built once per set of ranges, lengths and styles
+    and copied after that"""
+    key = repr(sorted(kwargs.items()))
+    if key not in _PLANES:
+        _PLANES[key] = CompactNumberPlane(**kwargs)
+    return _PLANES[key].copy()
+
+
+class RevealGrid(Animation):
+    """Draws every line of a plane at the same time, each growing from its start.
+
+    Create would draw the lines one after another, partial curve by partial
+    curve. Here each straight segment's Bézier points are pulled towards its
+    start in one array operation per mobject and frame.
+    """
+
+    def __init__(self, plane, introducer=True, **kwargs):
+        super().__init__(plane, introducer=introducer, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        for mobject, start in zip(
+            self.mobject.family_members_with_points(), self.starting_mobject.family_members_with_points()
+        ):
+            nppcc = mobject.n_points_per_cubic_curve
+            curves = start.points.reshape(-1, nppcc, 3)
+            mobject.points = (curves[:, :1] + alpha * (curves - curves[:, :1])).reshape(-1, 3)
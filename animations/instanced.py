@@ -0,0 +1,140 @@
+from manim import *
+import numpy as np
+
+# Many dots or segments drawn from one array. Cairo draws a VMobject with one
+# fill and one stroke call however many subpaths it has, so every instance
+# becomes a subpath of a single VMobject per distinct style instead of a
+# mobject of its own. A fiber with hundreds of points is then one or a few
+# mobjects to style, animate and rasterize.
+
+
+def _per_instance(values, count, name):
+    if isinstance(values, (str, ManimColor)) or np.ndim(values) == 0:
+        return [values] * count
+    values = list(values)
+    if len(values) != count:
+        raise ValueError(f"{name} has {len(values)} entries for {count} instances")
+    return values
+
+
+def _batches(keys):
+    """Indices of the instances sharing each distinct key, in order of first appearance"""
+    indices = {}
+    for index, key in enumerate(keys):
+        indices.setdefault(key, []).append(index)
+    return [np.array(batch) for batch in indices.values()]
+
+
+_UNIT_CIRCLE = None
+
+
+def _unit_circle():
+    # The Bézier points of a Dot of radius 1 at the origin
+    global _UNIT_CIRCLE
+    if _UNIT_CIRCLE is None:
+        _UNIT_CIRCLE = Circle(radius=1).get_points().copy()
+    return _UNIT_CIRCLE
+
+
+class DotCloud(VGroup):
+    """N dots at an (N, 3) array of centers, with one color and radius per dot
+    or one for all. The dots of each color are filled as one VMobject."""
+
+    def __init__(self, points, radius=DEFAULT_DOT_RADIUS, color=WHITE, fill_opacity=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.centers = np.array(points, dtype=float).reshape(-1, 3)
+        count = len(self.centers)
+        self.radii = np.array(_per_instance(radius, count, "radius"), dtype=float)
+        self.instance_colors = [ManimColor(color) for color in _per_instance(color, count, "color")]
+        self.batches = _batches([color.to_hex() for color in self.instance_colors])
+        for indices in self.batches:
+            self.add(VMobject(
+                fill_color=self.instance_colors[indices[0]], fill_opacity=fill_opacity, stroke_width=0
+            ))
+        self.update_instances()
+
+    def update_instances(self):
+        """Rebuild the dots from centers and radii"""
+        template = _unit_circle()
+        for batch, indices in zip(self.submobjects, self.batches):
+            circles = self.centers[indices, None] + self.radii[indices, None, None] * template
+            batch.set_points(circles.reshape(-1, 3))
+        return self
+
+    def set_centers(self, points):
+        self.centers[...] = points
+        return self.update_instances()
+
+    def set_radii(self, radius):
+        self.radii[...] = radius
+        return self.update_instances()
+
+
+class LineSet(VGroup):
+    """N straight segments from (N, 3) arrays of starts and ends, with one color
+    and stroke width per segment or one for all. The segments of each color
+    and width are stroked as one VMobject.
+
+    With a dash_length the segments are dashed like DashedLine, but the
+    dashes stay subpaths of that one VMobject instead of becoming a mobject
+    each, so fading or transforming dashed connectors costs about as much as
+    solid ones.
+    """
+
+    def __init__(self, starts, ends, color=WHITE, stroke_width=DEFAULT_STROKE_WIDTH, stroke_opacity=1.0,
+                 dash_length=None, dashed_ratio=0.5, **kwargs):
+        super().__init__(**kwargs)
+        self.starts = np.array(starts, dtype=float).reshape(-1, 3)
+        self.ends = np.broadcast_to(np.array(ends, dtype=float).reshape(-1, 3), self.starts.shape).copy()
+        self.dash_length = dash_length
+        self.dashed_ratio = dashed_ratio
+        count = len(self.starts)
+        self.instance_colors = [ManimColor(color) for color in _per_instance(color, count, "color")]
+        self.stroke_widths = np.array(_per_instance(stroke_width, count, "stroke_width"), dtype=float)
+        self.batches = _batches([
+            (color.to_hex(), width) for color, width in zip(self.instance_colors, self.stroke_widths)
+        ])
+        for indices in self.batches:
+            self.add(VMobject(
+                stroke_color=self.instance_colors[indices[0]], stroke_width=self.stroke_widths[indices[0]],
+                stroke_opacity=stroke_opacity, fill_opacity=0
+            ))
+        self.update_instances()
+
+    def dash_proportions(self, starts, ends):
+        """Segment index, start and end proportion of every dash.
+
+        The same pattern DashedLine draws: max(2, ceil(length / dash_length *
+        dashed_ratio)) dashes that cover dashed_ratio of the segment, with
+        equal gaps, starting and ending with a dash.
+        """
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        counts = np.maximum(2, np.ceil(lengths / self.dash_length * self.dashed_ratio)).astype(int)
+        dash = self.dashed_ratio / counts
+        period = dash + (1 - self.dashed_ratio) / (counts - 1)
+        segment = np.repeat(np.arange(len(counts)), counts)
+        number = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        dash_starts = number * period[segment]
+        return segment, dash_starts, dash_starts + dash[segment]
+
+    def segment_points(self, indices):
+        """Bézier points of the segments, or of their dashes, shape (pieces, 4, 3),
+        with the handles at the thirds as Line places them"""
+        starts, ends = self.starts[indices], self.ends[indices]
+        thirds = np.array([0, 1 / 3, 2 / 3, 1])
+        if self.dash_length is None:
+            return starts[:, None] + thirds[None, :, None] * (ends - starts)[:, None]
+        segment, dash_starts, dash_ends = self.dash_proportions(starts, ends)
+        proportions = dash_starts[:, None] + thirds * (dash_ends - dash_starts)[:, None]
+        return starts[segment, None] + proportions[..., None] * (ends - starts)[segment, None]
+
+    def update_instances(self):
+        """Rebuild the segments from starts and ends"""
+        for batch, indices in zip(self.submobjects, self.batches):
+            batch.set_points(self.segment_points(indices).reshape(-1, 3))
+        return self
+
+    def set_endpoints(self, starts, ends):
+        self.starts[...] = starts
+        self.ends[...] = ends
+        return self.update_instances()
@@ -0,0 +1,179 @@
+"""Report and trim the render caches under media/.
+
+    python media_cache.py report                # space used by each scene
+    python media_cache.py collect --budget 40M  # evict stale files down to 40 MB
+    python media_cache.py collect --budget 0 -n # show what a full clean would remove
+
+manim keeps every animation it ever rendered in partial_movie_files and
+every Tex string it ever compiled in media/Tex, keyed by hash. A file is
+in use when the latest render of a scene needs it:
+
+- partial movies listed in that scene's partial_movie_file_list.txt, which
+  manim rewrites on each render;
+- Tex files that the scene creates, recorded in media/cache_usage.json by
+  a dry run of the scene (redone whenever the scene file is newer than the
+  record).
+
+Files in use are never removed. The others are evicted least recently
+used first until the caches fit in the budget.
+"""
+import argparse
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from rendering import ANIMATIONS_DIR, MEDIA_DIR, dry_run, find_scenes, load_json, write_json
+
+USAGE_PATH = MEDIA_DIR / "cache_usage.json"
+TEX_DIR = MEDIA_DIR / "Tex"
+FILE_LIST = "partial_movie_file_list.txt"
+
+
+@contextmanager
+def recording_tex_files():
+    """Collect the hashed name of every Tex file compiled (or found cached) meanwhile"""
+    import manim.mobject.text.tex_mobject as tex_mobject
+
+    used = set()
+    tex_to_svg_file = tex_mobject.tex_to_svg_file
+
+    def recorded(*args, **kwargs):
+        svg_file = tex_to_svg_file(*args, **kwargs)
+        used.add(Path(svg_file).stem)
+        return svg_file
+
+    tex_mobject.tex_to_svg_file = recorded
+    try:
+        yield used
+    finally:
+        tex_mobject.tex_to_svg_file = tex_to_svg_file
+
+
+def record_tex_usage(file, scene, usage):
+    with recording_tex_files() as used:
+        dry_run(file, scene)
+    usage[scene] = {"file": Path(file).name, "tex": sorted(used), "recorded": time.time()}
+
+
+def update_usage(scenes, usage_path=USAGE_PATH):
+    usage = load_json(usage_path, {})
+    for file, scene in scenes:
+        if scene not in usage or file.stat().st_mtime > usage[scene]["recorded"]:
+            print(f"{scene}: recording Tex usage")
+            record_tex_usage(file, scene, usage)
+    write_json(usage_path, usage)
+    return usage
+
+
+def partial_movie_dirs():
+    """{scene name: [partial movie folders]}, across qualities and render_segments workers"""
+    directories = {}
+    for file_list_dir in sorted(MEDIA_DIR.glob("**/partial_movie_files/*/")):
+        directories.setdefault(file_list_dir.name, []).append(file_list_dir)
+    return directories
+
+
+def listed_partial_files(directory):
+    file_list = directory / FILE_LIST
+    if not file_list.exists():
+        return set()
+    # Entries look like `file 'file:/abs/path/123_456_789.mp4'`, possibly from another machine
+    return {
+        line.strip().rstrip("'").replace("\\", "/").rsplit("/", 1)[-1]
+        for line in file_list.read_text().splitlines()
+        if line.startswith("file ")
+    }
+
+
+def cache_entries(usage, scenes):
+    """(scene or None, path, in use) for every cached file; Tex files are shared, hence None"""
+    names = {scene for _, scene in scenes}
+    entries = []
+    for scene, directories in partial_movie_dirs().items():
+        for directory in directories:
+            listed = listed_partial_files(directory) if scene in names else set()
+            for path in directory.glob("*.mp4"):
+                entries.append((scene, path, path.name in listed))
+    used_tex = {stem for scene in names for stem in usage.get(scene, {}).get("tex", [])}
+    for path in TEX_DIR.glob("*"):
+        entries.append((None, path, path.stem in used_tex))
+    return entries
+
+
+def report(usage, scenes, entries):
+    sizes = {path: path.stat().st_size for _, path, _ in entries}
+    rows = []
+    for scene in sorted({scene for scene, _, _ in entries if scene} | {name for _, name in scenes}):
+        partial = [(path, in_use) for owner, path, in_use in entries if owner == scene]
+        tex = set(usage.get(scene, {}).get("tex", []))
+        tex_bytes = sum(sizes[path] for owner, path, _ in entries if owner is None and path.stem in tex)
+        rows.append((
+            scene,
+            sum(sizes[path] for path, in_use in partial if in_use),
+            sum(sizes[path] for path, in_use in partial if not in_use),
+            tex_bytes,
+        ))
+    unused_tex = sum(sizes[path] for owner, path, in_use in entries if owner is None and not in_use)
+
+    print(f"{'scene':<28}{'partial in use':>16}{'partial stale':>16}{'tex':>10}")
+    for scene, in_use, stale, tex_bytes in rows:
+        print(f"{scene:<28}{format_size(in_use):>16}{format_size(stale):>16}{format_size(tex_bytes):>10}")
+    print(f"{'unused tex':<28}{'':>16}{'':>16}{format_size(unused_tex):>10}")
+    print(f"{'total':<28}{format_size(sum(sizes.values())):>42}")
+
+
+def collect(entries, budget, dry=False):
+    """Delete files not in use, least recently used first, until the total fits in budget"""
+    stats = {path: path.stat() for _, path, _ in entries}
+    total = sum(stat.st_size for stat in stats.values())
+    stale = sorted(
+        (path for _, path, in_use in entries if not in_use),
+        key=lambda path: max(stats[path].st_atime, stats[path].st_mtime)
+    )
+    removed = 0
+    for path in stale:
+        if total <= budget:
+            break
+        if not dry:
+            path.unlink(missing_ok=True)
+        total -= stats[path].st_size
+        removed += stats[path].st_size
+        print(f"{'would remove' if dry else 'removed'} {path.relative_to(ANIMATIONS_DIR)}")
+    print(f"{format_size(removed)} freed, {format_size(total)} left (budget {format_size(budget)})")
+    if total > budget:
+        print("everything left is in use by the latest renders")
+
+
+def format_size(size):
+    for unit in ("B", "K", "M", "G"):
+        if size < 1024 or unit == "G":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+def parse_size(text):
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("report", "collect"))
+    parser.add_argument("--budget", type=parse_size, default="64M", help="size to trim the caches to, e.g. 500K, 40M")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="only list what collect would remove")
+    args = parser.parse_args()
+
+    scenes = find_scenes()
+    usage = update_usage(scenes)
+    entries = cache_entries(usage, scenes)
+    if args.command == "report":
+        report(usage, scenes, entries)
+    else:
+        collect(entries, args.budget, dry=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
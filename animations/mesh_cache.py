@@ -0,0 +1,134 @@
+from manim import *
+import hashlib
+import inspect
+import os
+import tempfile
+import types
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def function_fingerprint(func, _seen=None):
+    """Text that changes whenever func would compute something different.
+
+    Covers the source (or bytecode when the source is unavailable), default
+    arguments, the values captured in its closure, and, recursively, the
+    functions it calls by global name from our own modules (e.g. torus_func
+    inside a lambda).
+    """
+    _seen = set() if _seen is None else _seen
+    if id(func) in _seen:
+        return ""
+    _seen.add(id(func))
+
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    parts = [source, repr(func.__defaults__), repr(func.__kwdefaults__)]
+
+    def describe(value):
+        if isinstance(value, types.FunctionType):
+            return function_fingerprint(value, _seen)
+        if isinstance(value, np.ndarray):
+            return hashlib.sha256(value.tobytes()).hexdigest()
+        return repr(value)
+
+    for cell in func.__closure__ or ():
+        parts.append(describe(cell.cell_contents))
+    for name in func.__code__.co_names:
+        value = func.__globals__.get(name)
+        if isinstance(value, types.FunctionType) and not value.__module__.startswith(("manim", "numpy")):
+            parts.append(describe(value))
+    return "\n".join(parts)
+
+
+class MeshCache:
+    """Tessellated point arrays stored as .npy files under media/mesh_cache.
+
+    Entries are keyed by a hash of whatever describes the mesh (for surfaces:
+    the parametrization's fingerprint, ranges and resolution) and loaded
+    memory-mapped. Every hit refreshes the file's modification time, and
+    when the directory grows past max_bytes the least recently used entries
+    are deleted.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self._directory = directory
+        self.max_bytes = max_bytes
+
+    @property
+    def directory(self):
+        # Resolved lazily so that --media_dir given on the command line applies
+        directory = Path(self._directory or Path(config.media_dir) / "mesh_cache")
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def key(self, *parts):
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                part = part.tobytes()
+            elif not isinstance(part, bytes):
+                part = repr(part).encode()
+            digest.update(part)
+        return digest.hexdigest()[:32]
+
+    def path(self, key):
+        return self.directory / f"{key}.npy"
+
+    def load(self, key):
+        path = self.path(key)
+        try:
+            os.utime(path)
+            return np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            # Not cached, or evicted by another render just now
+            return None
+
+    def save(self, key, array):
+        path = self.path(key)
+        # A name of its own per writer, since parallel renders share entries;
+        # the .tmp suffix keeps it out of the *.npy globs below
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{key}.", suffix=".tmp", delete=False) as file:
+            np.save(file, np.ascontiguousarray(array))
+        os.replace(file.name, path)
+        self.evict()
+        return path
+
+    def get_or_compute(self, key, compute):
+        array = self.load(key)
+        if array is None:
+            array = compute()
+            self.save(key, array)
+        return array
+
+    def entries(self):
+        """(modification time, size, path) of every entry, skipping files that
+        another process replaces or evicts meanwhile"""
+        entries = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+mesh_cache = MeshCache()
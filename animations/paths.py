@@ -0,0 +1,142 @@
+from manim import *
+import numpy as np
+
+from surfaces import LevelOfDetail
+
+# Bernstein weights of a cubic Bézier curve at the 10 samples VMobject uses
+# to measure curve lengths
+_LENGTH_SAMPLES = np.linspace(0, 1, 10)
+_LENGTH_WEIGHTS = np.stack([
+    (1 - _LENGTH_SAMPLES) ** 3,
+    3 * _LENGTH_SAMPLES * (1 - _LENGTH_SAMPLES) ** 2,
+    3 * _LENGTH_SAMPLES ** 2 * (1 - _LENGTH_SAMPLES),
+    _LENGTH_SAMPLES ** 3
+], axis=1)
+
+
+class ArcLengthLookup:
+    """Mixin for VMobjects that answers point_from_proportion from a cached table.
+
+    VMobject.point_from_proportion measures every Bézier curve of the path on
+    each call, which MoveAlongPath and updaters do once per frame. Here the
+    cumulative curve lengths are computed for all curves at once, kept until
+    the points change, and each lookup is a binary search. Results are the
+    same as VMobject's.
+
+    Whether the points changed is judged from the shape of the points array
+    and a handful of its rows, so checking costs the same for any path
+    length. manim's transforms move every point (shift, scale, rotate,
+    apply_function), which that catches; call clear_arc_length_table after
+    editing single points.
+    """
+
+    # Left out of stable play hashes (see stable_hashing.py)
+    CACHE_ATTRIBUTES = ("_arc_length_table", "_arc_length_key")
+
+    def _arc_length_version(self):
+        points = self.points
+        stride = max(1, len(points) // 16)
+        return points.shape, points[::stride].tobytes(), points[-1:].tobytes()
+
+    def clear_arc_length_table(self):
+        self._arc_length_key = None
+
+    def get_arc_length_table(self):
+        version = self._arc_length_version()
+        if getattr(self, "_arc_length_key", None) != version:
+            nppcc = self.n_points_per_cubic_curve
+            curves = self.points[: len(self.points) // nppcc * nppcc].reshape(-1, nppcc, 3)
+            samples = np.einsum("sk,nkd->nsd", _LENGTH_WEIGHTS, curves)
+            lengths = np.linalg.norm(np.diff(samples, axis=1), axis=2).sum(axis=1)
+            self._arc_length_table = np.cumsum(lengths)
+            self._arc_length_key = version
+        return self._arc_length_table
+
+    def point_from_proportion(self, alpha):
+        if alpha < 0 or alpha > 1:
+            raise ValueError(f"Alpha {alpha} not between 0 and 1.")
+
+        self.throw_error_if_no_points()
+        if alpha == 1:
+            return self.points[-1]
+
+        cumulative_lengths = self.get_arc_length_table()
+        target_length = alpha * cumulative_lengths[-1]
+        # First curve that ends at or beyond the target length
+        index = min(np.searchsorted(cumulative_lengths, target_length), len(cumulative_lengths) - 1)
+        curve_start = cumulative_lengths[index - 1] if index > 0 else 0
+        length = cumulative_lengths[index] - curve_start
+        residue = (target_length - curve_start) / length if length != 0 else 0
+
+        nppcc = self.n_points_per_cubic_curve
+        return bezier(self.points[nppcc * index : nppcc * (index + 1)])(residue)
+
+
+def hermite_path_points(t_values, points):
+    """Bézier points of the cubic Hermite curve through points at t_values.
+
+    Tangents are finite differences over the neighbouring samples (one-sided
+    at the ends), so the handles follow the spacing of the samples instead of
+    assuming it is uniform, as make_smooth does.
+    """
+    t_values = np.asarray(t_values, dtype=float)
+    tangents = np.gradient(points, t_values, axis=0)
+    h = np.diff(t_values)[:, None]
+    return np.stack([
+        points[:-1],
+        points[:-1] + h * tangents[:-1] / 3,
+        points[1:] - h * tangents[1:] / 3,
+        points[1:],
+    ], axis=1).reshape(-1, 3)
+
+
+def adaptive_samples(points_of, t_range, lod=None, initial_samples=32, max_rounds=12):
+    """Parameters and points where the Hermite curve through them stays within
+    the lod's screen-space error of the true curve.
+
+    points_of takes an array of t and returns points of shape (len(t), 3); it is
+    called once up front and then once per round, on the midpoints of all
+    intervals. Each round compares the true midpoint of every interval with
+    the Hermite curve's midpoint, (p0 + p1) / 2 + h (m0 - m1) / 8, and splits
+    the intervals where they are further apart than the error, keeping those
+    midpoints as new samples, so samples gather at tight turns and straight
+    stretches keep the initial spacing.
+    """
+    lod = lod or LevelOfDetail()
+    t_values = np.linspace(*t_range, initial_samples + 1)
+    points = points_of(t_values)
+    extent = np.linalg.norm(points - points.mean(axis=0), axis=1).max()
+    error = lod.error_in_scene_units(extent)
+    for _ in range(max_rounds):
+        middles = (t_values[:-1] + t_values[1:]) / 2
+        tangents = np.gradient(points, t_values, axis=0)
+        h = np.diff(t_values)[:, None]
+        predicted = (points[:-1] + points[1:]) / 2 + h * (tangents[:-1] - tangents[1:]) / 8
+        middle_points = points_of(middles)
+        split = np.linalg.norm(middle_points - predicted, axis=1) > error
+        if not split.any():
+            break
+        # The midpoints that failed become samples, already evaluated
+        order = np.argsort(np.concatenate([t_values, middles[split]]), kind="stable")
+        t_values = np.concatenate([t_values, middles[split]])[order]
+        points = np.concatenate([points, middle_points[split]])[order]
+    return t_values, points
+
+
+class AdaptiveParametricFunction(ArcLengthLookup, VMobject):
+    """A parametric curve sampled by adaptive_samples, evaluated on arrays of t.
+
+    function is array-aware like the parametrizations in surfaces.py: given an
+    array of t it returns the x, y and z components. Pass the scene's
+    LevelOfDetail as lod to bound the error at its zoom and output width.
+    """
+
+    def __init__(self, function, t_range=[0, 1], lod=None, **kwargs):
+        super().__init__(**kwargs)
+        self.function = function
+        self.t_range = t_range
+        self.t_values, samples = adaptive_samples(self.points_of, t_range, lod)
+        self.set_points(hermite_path_points(self.t_values, samples))
+
+    def points_of(self, t_values):
+        return np.stack(np.broadcast_arrays(*self.function(t_values)), axis=-1).astype(float)
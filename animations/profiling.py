@@ -0,0 +1,245 @@
+"""Profile where a scene's render time goes, phase by phase.
+
+    python profiling.py TorusCover            # low quality, media/traces/TorusCover.json
+    python profiling.py TorusCover -q h -o torus.json
+
+The scene is rendered in this process with caching disabled while the
+phases of manim's render loop are timed. The result is a Chrome trace:
+open it in https://ui.perfetto.dev or chrome://tracing. Each span carries
+the scene name, the index of the play and the classes of its animations.
+
+    construct       the scene's construct, including everything below
+    build Surface   Surface construction (tessellation, mesh cache)
+    tex             Tex/MathTex compilation or cache lookup
+    play            one self.play or self.wait
+    setup           begin() of the play's animations
+    animate         one frame's update_to_time
+    interpolate     one animation's interpolate, inside animate
+    updaters        mobject updaters (always_redraw, add_updater), inside animate
+    rasterize       Camera.capture_mobjects, i.e. Cairo drawing; its args
+                    hold the time spent projecting 3D points in that frame
+    depth sort      choosing and ordering the mobjects to draw (3D z-sort)
+    encode          handing the frame to ffmpeg (time blocked on the pipe)
+    finish          closing the movie and combining partial files
+
+Projection runs once per mobject per frame, too often for spans of its
+own, so it is summed per frame instead and also shown as a counter track.
+"""
+import argparse
+import functools
+import json
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from rendering import MEDIA_DIR, QUALITIES, find_scenes, load_scene_class, quality_config, wrap_plays
+
+TRACES_DIR = MEDIA_DIR / "traces"
+
+
+class Tracer:
+    """Collects Chrome trace events; timestamps are microseconds since creation"""
+
+    def __init__(self):
+        self.events = []
+        self.context = {}
+        self.accumulated = {}
+        self.open_spans = set()
+        self._origin = time.perf_counter_ns()
+
+    def now(self):
+        return (time.perf_counter_ns() - self._origin) / 1000
+
+    @contextmanager
+    def span(self, name, category, **args):
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.events.append({
+                "name": name, "cat": category, "ph": "X", "ts": start, "dur": self.now() - start,
+                "pid": 1, "tid": 1, "args": {**self.context, **args},
+            })
+
+    def counter(self, name, **values):
+        self.events.append({"name": name, "ph": "C", "ts": self.now(), "pid": 1, "tid": 1, "args": values})
+
+    def accumulate(self, name, microseconds):
+        self.accumulated[name] = self.accumulated.get(name, 0) + microseconds
+
+    def take(self, name):
+        return self.accumulated.pop(name, 0)
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "manim"}},
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "render loop"}},
+        ]
+        path.write_text(json.dumps({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}))
+        return path
+
+
+def patch(owner, name, make_replacement):
+    """Replace owner.name by make_replacement(original) and return a function that undoes it"""
+    had_own = name in vars(owner)
+    original = getattr(owner, name)
+    setattr(owner, name, functools.wraps(original)(make_replacement(original)))
+
+    def restore():
+        if had_own:
+            setattr(owner, name, original)
+        else:
+            delattr(owner, name)
+    return restore
+
+
+def timed(tracer, name, category):
+    """make_replacement for patch() that wraps the call in a span.
+
+    Calls nested in a span of the same name (an override calling super())
+    are not spanned again.
+    """
+    def make_replacement(original):
+        def replacement(*args, **kwargs):
+            if name in tracer.open_spans:
+                return original(*args, **kwargs)
+            tracer.open_spans.add(name)
+            try:
+                with tracer.span(name, category):
+                    return original(*args, **kwargs)
+            finally:
+                tracer.open_spans.discard(name)
+        return replacement
+    return make_replacement
+
+
+@contextmanager
+def instrumented(tracer):
+    """Time the phases of the Cairo render loop while the block runs"""
+    import manim.mobject.text.tex_mobject as tex_mobject
+    from manim import Camera, Scene, SceneFileWriter, Surface, ThreeDCamera
+
+    def begin_animations(original):
+        def replacement(scene):
+            with tracer.span("setup", "animation"):
+                original(scene)
+            tracer.context["animations"] = [type(animation).__name__ for animation in scene.animations]
+            for animation in scene.animations:
+                # Per instance, so subclasses that override interpolate are covered too
+                animation.interpolate = functools.wraps(animation.interpolate)(timed(
+                    tracer, f"interpolate {type(animation).__name__}", "animate"
+                )(animation.interpolate))
+        return replacement
+
+    def capture_mobjects(original):
+        def replacement(camera, *args, **kwargs):
+            tracer.take("projection")
+            with tracer.span("rasterize", "draw"):
+                original(camera, *args, **kwargs)
+            projection = tracer.take("projection")
+            # The rasterize span was the last one to close
+            tracer.events[-1]["args"]["projection_ms"] = round(projection / 1000, 3)
+            tracer.counter("projection", ms=projection / 1000)
+        return replacement
+
+    def project_points(original):
+        def replacement(*args, **kwargs):
+            start = tracer.now()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                tracer.accumulate("projection", tracer.now() - start)
+        return replacement
+
+    with ExitStack() as stack:
+        for owner, name, make_replacement in [
+            (Surface, "__init__", timed(tracer, "build Surface", "construct")),
+            (tex_mobject, "tex_to_svg_file", timed(tracer, "tex", "construct")),
+            (Scene, "begin_animations", begin_animations),
+            (Scene, "update_to_time", timed(tracer, "animate", "animate")),
+            (Scene, "update_mobjects", timed(tracer, "updaters", "animate")),
+            (Camera, "capture_mobjects", capture_mobjects),
+            (Camera, "get_mobjects_to_display", timed(tracer, "depth sort", "draw")),
+            (ThreeDCamera, "get_mobjects_to_display", timed(tracer, "depth sort", "draw")),
+            (ThreeDCamera, "project_points", project_points),
+            (SceneFileWriter, "write_frame", timed(tracer, "encode", "encode")),
+            (SceneFileWriter, "finish", timed(tracer, "finish", "encode")),
+        ]:
+            if owner is ThreeDCamera and name not in vars(ThreeDCamera):
+                # Inherited from Camera, which is patched already
+                continue
+            stack.callback(patch(owner, name, make_replacement))
+        yield tracer
+
+
+def profile_scene(file, scene_name, quality="l"):
+    from manim import tempconfig
+
+    tracer = Tracer()
+    scene_class = load_scene_class(file, scene_name)
+
+    plays_started = []
+
+    def traced_play(play, scene, *args, **kwargs):
+        index = tracer.context["play"] = len(plays_started)
+        plays_started.append(index)
+        start = tracer.now()
+        try:
+            play(scene, *args, **kwargs)
+        finally:
+            # Named after the animations, which are only known once the play has begun
+            animations = tracer.context.pop("animations", [])
+            tracer.events.append({
+                "name": "play " + ", ".join(animations), "cat": "play", "ph": "X",
+                "ts": start, "dur": tracer.now() - start, "pid": 1, "tid": 1,
+                "args": {"scene": scene_name, "play": index, "animations": animations},
+            })
+            # Spans between plays belong to construct, not to the last play
+            del tracer.context["play"]
+
+    with tempfile.TemporaryDirectory() as video_dir, tempconfig({
+        **quality_config(quality),
+        "disable_caching": True,
+        "media_dir": str(MEDIA_DIR),
+        "video_dir": video_dir,
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+    }), instrumented(tracer):
+        tracer.context["scene"] = scene_name
+        scene = scene_class()
+        wrap_plays(scene, traced_play)
+        scene.construct = timed(tracer, "construct", "construct")(scene.construct)
+        scene.render()
+    return tracer
+
+
+def summarize(tracer):
+    """Total time per span name, excluding the enclosing construct and play spans"""
+    totals = {}
+    for event in tracer.events:
+        if event["ph"] == "X" and event["cat"] not in ("play",) and event["name"] != "construct":
+            name = event["name"].split(" ")[0] if event["name"].startswith("interpolate") else event["name"]
+            totals[name] = totals.get(name, 0) + event["dur"]
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-o", "--output", type=Path)
+    args = parser.parse_args()
+
+    file = next(file for file, scene in find_scenes() if scene == args.scene)
+    tracer = profile_scene(file, args.scene, args.quality)
+    output = tracer.save(args.output or TRACES_DIR / f"{args.scene}.json")
+    for name, microseconds in summarize(tracer).items():
+        print(f"{name:<16}{microseconds / 1e6:>9.2f}s")
+    print(f"trace written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Render every scene in this folder in parallel and write a manifest.
+
+    python render_all.py                 # all scenes at 1080p60
+    python render_all.py -q l TorusCover # only some scenes, at 480p15
+    python render_all.py -q l --preview  # quick drafts without LaTeX, in media/preview
+    python render_all.py --stable-hash   # reuse partial movies across closure edits
+    python render_all.py --tex-batch     # compile new Tex strings in one batch first
+
+Scenes run as separate manim processes, as many at a time as there are
+cores. The longest scenes (by the timings in the previous manifest) start
+first, so a full rebuild takes about as long as the slowest scene. With
+--tex-batch the Tex strings are compiled beforehand in one batch (see
+tex_batch.py); that dry-runs every scene in this process first, which pays
+off after adding many new strings but only delays a build whose media/Tex
+is already complete.
+media/render_manifest.json records the output path, video duration, wall
+time and peak memory of each scene. With --stable-hash the plays are hashed
+as described in stable_hashing.py and media/hash_reports/ explains every
+play that was rendered again.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from rendering import (
+    ANIMATIONS_DIR, MEDIA_DIR, QUALITIES, available_cores, find_scenes, load_json,
+    run_manim, video_duration, video_path, write_json
+)
+from stable_hashing import ENVIRONMENT_VARIABLE as STABLE_HASH_VARIABLE
+from tex_batch import prepare_tex
+from tex_preview import ENVIRONMENT_VARIABLE
+
+MANIFEST_PATH = MEDIA_DIR / "render_manifest.json"
+PREVIEW_MEDIA_DIR = MEDIA_DIR / "preview"
+
+
+def render(file, scene, quality, preview=False, stable_hash=False):
+    env = {STABLE_HASH_VARIABLE: "1"} if stable_hash else {}
+    if preview:
+        # See tex_preview.py; previews get their own media folder
+        returncode, wall_time, peak_rss = run_manim(
+            file, scene, quality, ["--media_dir", str(PREVIEW_MEDIA_DIR)],
+            log_path=PREVIEW_MEDIA_DIR / "logs" / f"{scene}.log", env={**env, ENVIRONMENT_VARIABLE: "1"}
+        )
+        output = video_path(file, scene, quality, PREVIEW_MEDIA_DIR)
+    else:
+        returncode, wall_time, peak_rss = run_manim(file, scene, quality, env=env)
+        output = video_path(file, scene, quality)
+    return {
+        "file": file.name,
+        "output": str(output.relative_to(ANIMATIONS_DIR)),
+        "returncode": returncode,
+        "duration": video_duration(output),
+        "wall_time": round(wall_time, 2),
+        "peak_rss_mb": round(peak_rss, 1),
+    }
+
+
+def schedule(scenes, previous):
+    # Longest first; scenes without a past timing may be long, so they go first too
+    past = {name: entry.get("wall_time") for name, entry in previous.get("scenes", {}).items()}
+    return sorted(scenes, key=lambda scene: -(past.get(scene[1]) or float("inf")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene names to render (default: all)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="h")
+    parser.add_argument("-j", "--jobs", type=int, default=available_cores())
+    parser.add_argument("--manifest", default=None, help=f"default: {MANIFEST_PATH.relative_to(ANIMATIONS_DIR)}")
+    parser.add_argument("--tex-batch", action="store_true", help="compile missing Tex in one batch before rendering")
+    parser.add_argument("--preview", action="store_true", help="typeset Tex without LaTeX, into media/preview")
+    parser.add_argument("--stable-hash", action="store_true", help="hash plays with stable_hashing.py")
+    args = parser.parse_args()
+    manifest = args.manifest or (PREVIEW_MEDIA_DIR if args.preview else MEDIA_DIR) / MANIFEST_PATH.name
+
+    scenes = find_scenes()
+    if args.scenes:
+        scenes = [scene for scene in scenes if scene[1] in args.scenes]
+    previous = load_json(manifest, {})
+    scenes = schedule(scenes, previous)
+    if args.tex_batch and not args.preview:
+        prepare_tex(scenes)
+
+    results = dict(previous.get("scenes", {}))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {
+            pool.submit(render, file, name, args.quality, args.preview, args.stable_hash): name
+            for file, name in scenes
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            results[name] = result = future.result()
+            status = "ok" if result["returncode"] == 0 else f"failed ({result['returncode']})"
+            print(f"{name}: {status} in {result['wall_time']:.1f}s, peak {result['peak_rss_mb']:.0f} MB")
+
+    write_json(manifest, {
+        "quality": QUALITIES[args.quality],
+        "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "wall_time": round(time.perf_counter() - start, 2),
+        "scenes": results,
+    })
+    if any(results[name]["returncode"] != 0 for _, name in scenes):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
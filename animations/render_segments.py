@@ -0,0 +1,112 @@
+"""Render one scene on several cores by splitting it at play boundaries.
+
+    python render_segments.py TorusCover.py TorusCover -q h -j 8
+
+A dry pass runs construct with every animation skipped to find out how
+many plays the scene has and how long each one runs. The plays are then
+split into contiguous segments of about equal run time, and each segment
+is rendered by its own manim process with `-n first,last`. manim
+fast-forwards the scene state through the earlier plays without drawing
+them and only rasterizes and encodes that segment. The segment videos are
+joined in order into the usual media/videos/<file>/<quality>/<Scene>.mp4.
+
+Every worker has its own partial_movie_files folder under
+media/segments/<Scene>/. The Tex cache is shared and filled in one batch
+before the workers start.
+"""
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from rendering import (
+    ANIMATIONS_DIR, MEDIA_DIR, QUALITIES, available_cores, dry_run, run_manim, video_path
+)
+from tex_batch import prepare_tex
+
+SEGMENTS_DIR = MEDIA_DIR / "segments"
+
+
+def split_plays(run_times, segments):
+    """Inclusive (first, last) play indices of contiguous segments with similar total run time"""
+    segments = max(1, min(segments, len(run_times) // 2))
+    ends = np.cumsum(run_times)
+    targets = ends[-1] * np.arange(1, segments) / segments
+    cuts = sorted(set(int(i) for i in np.searchsorted(ends, targets)))
+    # manim treats `-n 0,0` as "no upper bound", so the first segment needs two plays
+    cuts = [cut for cut in cuts if 1 <= cut < len(run_times) - 1]
+    bounds, first = [], 0
+    for cut in cuts:
+        bounds.append((first, cut))
+        first = cut + 1
+    bounds.append((first, len(run_times) - 1))
+    return bounds
+
+
+def write_segment_config(scene, index):
+    directory = SEGMENTS_DIR / scene / str(index)
+    directory.mkdir(parents=True, exist_ok=True)
+    config_file = directory / "manim.cfg"
+    config_file.write_text(
+        "[CLI]\n"
+        f"video_dir = {directory}\n"
+        f"tex_dir = {MEDIA_DIR / 'Tex'}\n"
+    )
+    return config_file, directory
+
+
+def render_segment(file, scene, quality, index, first, last, is_last):
+    config_file, directory = write_segment_config(scene, index)
+    plays = f"{first}" if is_last else f"{first},{last}"
+    extra_args = ["--config_file", str(config_file), "-o", f"{scene}_{index:03}"]
+    if not (is_last and first == 0):
+        extra_args += ["-n", plays]
+    returncode, wall_time, _ = run_manim(
+        file, scene, quality, extra_args, log_path=directory / "render.log"
+    )
+    if returncode != 0:
+        raise RuntimeError(f"segment {index} of {scene} failed, see {directory / 'render.log'}")
+    print(f"{scene}: plays {first}-{last} done in {wall_time:.1f}s")
+    return directory / f"{scene}_{index:03}.mp4"
+
+
+def concatenate(parts, output):
+    output.parent.mkdir(parents=True, exist_ok=True)
+    file_list = output.with_suffix(".segments.txt")
+    file_list.write_text("".join(f"file '{part}'\n" for part in parts))
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+         "-i", str(file_list), "-c", "copy", str(output)],
+        check=True
+    )
+    file_list.unlink()
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="h")
+    parser.add_argument("-j", "--jobs", type=int, default=available_cores())
+    args = parser.parse_args()
+    file = (ANIMATIONS_DIR / args.file).resolve()
+
+    prepare_tex([(file, args.scene)])
+    _, run_times = dry_run(file, args.scene)
+    bounds = split_plays(run_times, args.jobs)
+    print(f"{args.scene}: {len(run_times)} plays in {len(bounds)} segments")
+
+    with ThreadPoolExecutor(max_workers=len(bounds)) as pool:
+        parts = list(pool.map(
+            lambda job: render_segment(file, args.scene, args.quality, job[0], *job[1], job[0] == len(bounds) - 1),
+            enumerate(bounds)
+        ))
+    output = concatenate(parts, video_path(file, args.scene, args.quality))
+    print(f"{args.scene}: wrote {Path(output).relative_to(ANIMATIONS_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Helpers shared by the render scripts in this folder.
+
+Scenes are rendered with the manim CLI from this directory, so outputs land
+in media/videos/<file>/<quality>/<Scene>.mp4 exactly as with a manual
+`manim -qh TorusCover.py TorusCover`. Run as a script, this module is that
+CLI with the opt-in render modes installed, which a plain `manim` skips:
+
+    MANIM_TEX_PREVIEW=1 python rendering.py -ql TorusCover.py TorusCover
+"""
+import ast
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ANIMATIONS_DIR = Path(__file__).resolve().parent
+MEDIA_DIR = ANIMATIONS_DIR / "media"
+
+# manim quality flag -> name of the output folder it renders into
+QUALITIES = {
+    "l": "480p15",
+    "m": "720p30",
+    "h": "1080p60",
+    "p": "1440p60",
+    "k": "2160p60",
+}
+
+
+def find_scenes(directory=ANIMATIONS_DIR):
+    """(file, class name) for every Scene subclass defined in directory/*.py"""
+    scenes = []
+    for path in sorted(Path(directory).glob("*.py")):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and any(
+                isinstance(base, ast.Name) and base.id.endswith("Scene") for base in node.bases
+            ):
+                scenes.append((path, node.name))
+    return scenes
+
+
+def video_path(file, scene, quality="h", media_dir=MEDIA_DIR):
+    return Path(media_dir) / "videos" / Path(file).stem / QUALITIES[quality] / f"{scene}.mp4"
+
+
+def available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def install_render_modes():
+    """Patch manim for the modes whose environment variables are set:
+    LaTeX-free Tex (tex_preview.py) and stable play hashes (stable_hashing.py)"""
+    import stable_hashing
+    import tex_preview
+
+    if tex_preview.preview_requested():
+        tex_preview.install()
+    if stable_hashing.stable_hash_requested():
+        stable_hashing.install()
+
+
+def load_scene_class(file, scene):
+    """Import a scene file the way manim does, with this folder on sys.path"""
+    file = Path(file).resolve()
+    if str(file.parent) not in sys.path:
+        sys.path.insert(0, str(file.parent))
+    install_render_modes()
+    spec = importlib.util.spec_from_file_location(file.stem, file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[file.stem] = module
+    spec.loader.exec_module(module)
+    return getattr(module, scene)
+
+
+def wrap_plays(scene, wrapper):
+    """Route every play (and wait) of scene through wrapper(play, scene, *args, **kwargs)"""
+    play = scene.renderer.play
+    scene.renderer.play = lambda *args, **kwargs: wrapper(play, *args, **kwargs)
+    return scene
+
+
+def quality_config(quality):
+    """tempconfig entries that render at the given quality flag, like -q<flag> would"""
+    from manim.constants import QUALITIES as MANIM_QUALITIES
+
+    settings = next(value for value in MANIM_QUALITIES.values() if value["flag"] == quality)
+    return {key: settings[key] for key in ("pixel_height", "pixel_width", "frame_rate")}
+
+
+def dry_run(file, scene, **config_overrides):
+    """Run a scene's construct with every animation skipped and nothing written.
+
+    Returns the scene in its final state and the run time of each play.
+    """
+    from manim import tempconfig
+
+    scene_class = load_scene_class(file, scene)
+    run_times = []
+
+    def timed(play, scene, *args, **kwargs):
+        start = scene.renderer.time
+        play(scene, *args, **kwargs)
+        run_times.append(scene.renderer.time - start)
+
+    with tempconfig({"dry_run": True, "media_dir": str(MEDIA_DIR), **config_overrides}):
+        instance = scene_class(skip_animations=True)
+        wrap_plays(instance, timed)
+        instance.render()
+    return instance, run_times
+
+
+def run_manim(file, scene, quality="h", extra_args=(), log_path=None, env=None):
+    """Render one scene in a manim subprocess.
+
+    Returns the exit code, the wall time in seconds and the peak resident set
+    size of the render process in MB.
+    """
+    command = [
+        sys.executable, str(ANIMATIONS_DIR / "rendering.py"), "render", f"-q{quality}",
+        str(Path(file).name), scene, *extra_args
+    ]
+    log_path = Path(log_path or MEDIA_DIR / "logs" / f"{scene}.log")
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(
+            command, cwd=ANIMATIONS_DIR, stdout=log, stderr=subprocess.STDOUT,
+            env={**os.environ, **(env or {})}
+        )
+        # wait4 gives the resource usage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    wall_time = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return process.returncode, wall_time, peak_rss
+
+
+def video_duration(path):
+    """Duration of a video in seconds, or None without ffprobe or output"""
+    if shutil.which("ffprobe") is None or not Path(path).exists():
+        return None
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(path)],
+        capture_output=True, text=True
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def load_json(path, default=None):
+    path = Path(path)
+    if not path.exists():
+        return default
+    return json.loads(path.read_text())
+
+
+def write_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def main():
+    install_render_modes()
+    from manim.__main__ import main as manim_main
+
+    manim_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""Play hashes that survive closures and updaters, with a report of every cache miss.
+
+Renders started through rendering.py install it when MANIM_STABLE_HASH=1
+is set (`render_all.py --stable-hash` sets it):
+
+    MANIM_STABLE_HASH=1 python rendering.py -qh TorusCover.py TorusCover
+    python stable_hashing.py TorusCover       # why plays were re-rendered
+
+manim names each play's partial movie file after a hash of the camera, the
+animations and the mobjects in the scene. Functions enter that hash through
+their source, which for a lambda is the whole statement around it, and
+through the globals they use; the camera brings along every mobject ever
+fixed in frame, so one changed caption changes the hash of every later play.
+Here instead:
+
+- a function is its bytecode and constants (nested functions included), its
+  defaults, the values in its closure cells and the globals it names, so
+  editing the text next to an always_redraw lambda leaves its hash alone,
+  while changing a captured number or tracker value changes it;
+- mobjects, ValueTrackers included, are their points, style and updaters,
+  family by family, leaving out the lookup caches a class lists in
+  CACHE_ATTRIBUTES; a captured scene or camera counts as a marker only;
+- the camera is its own settings plus which of the scene's current
+  mobjects it keeps fixed in frame or orientation.
+
+Hashes keep manim's <camera>_<animations>_<mobjects> form. Every play of a
+render is recorded in media/hash_reports/<Scene>.json with a fingerprint per
+camera setting, animation and mobject. When a play misses the cache, it is
+compared with the same play of the previous render and the differences are
+logged and stored as its reasons.
+"""
+import argparse
+import hashlib
+import json
+import os
+import types
+import zlib
+
+import numpy as np
+
+from rendering import MEDIA_DIR, load_json, write_json
+
+ENVIRONMENT_VARIABLE = "MANIM_STABLE_HASH"
+REPORTS_DIR = MEDIA_DIR / "hash_reports"
+# Camera attributes that hold output or bookkeeping rather than settings
+CAMERA_SKIPPED = {"pixel_array", "background", "fixed_in_frame_mobjects", "fixed_orientation_mobjects"}
+MOBJECT_SKIPPED = {"submobjects", "points", "updaters"}
+
+
+def stable_hash_requested():
+    return os.environ.get(ENVIRONMENT_VARIABLE, "") not in ("", "0")
+
+
+def digest(state):
+    return zlib.crc32(json.dumps(state, sort_keys=True, default=str).encode())
+
+
+def array_digest(array):
+    array = np.ascontiguousarray(array)
+    return f"{array.dtype}{array.shape}:{hashlib.sha1(array.tobytes()).hexdigest()[:16]}"
+
+
+def code_state(code):
+    """Bytecode, names and constants of a code object, without line numbers or file names"""
+    return {
+        "bytecode": code.co_code.hex(),
+        "names": list(code.co_names),
+        "constants": [
+            code_state(constant) if isinstance(constant, types.CodeType)
+            # Sorted, since the order of a frozenset of strings changes with the hash seed
+            else repr(sorted(map(repr, constant))) if isinstance(constant, frozenset)
+            else repr(constant)
+            for constant in code.co_consts
+        ],
+    }
+
+
+def _global_names(code):
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names |= _global_names(constant)
+    return names
+
+
+class Describer:
+    """Turns scene objects into JSON-able states that are equal exactly when
+    they would render the same. Objects met twice are referred to by the
+    order in which they were first met, so cycles end and ids never leak in."""
+
+    def __init__(self):
+        from manim import Camera, ManimColor, Mobject, Scene
+
+        self.kinds = (Camera, ManimColor, Mobject, Scene)
+        self.seen = {}
+
+    def __call__(self, value):
+        Camera, ManimColor, Mobject, Scene = self.kinds
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return array_digest(value)
+        if isinstance(value, ManimColor):
+            return value.to_hex(with_alpha=True)
+        if isinstance(value, (list, tuple)):
+            return [self(item) for item in value]
+        if isinstance(value, (set, frozenset)):
+            return sorted((self(item) for item in value), key=lambda state: json.dumps(state, default=str))
+        if isinstance(value, dict):
+            return {str(key): self(item) for key, item in sorted(value.items(), key=lambda item: str(item[0]))}
+        if isinstance(value, types.ModuleType):
+            return f"<module {value.__name__}>"
+        if isinstance(value, type):
+            return f"<class {value.__module__}.{value.__qualname__}>"
+        if isinstance(value, (Scene, Camera)):
+            # Whatever a closure reads from these is in the scene's own state
+            return f"<{type(value).__name__}>"
+        if id(value) in self.seen:
+            return {"ref": self.seen[id(value)]}
+        self.seen[id(value)] = len(self.seen)
+        if isinstance(value, types.FunctionType):
+            return self.function(value)
+        if isinstance(value, types.MethodType):
+            return {"method": self(value.__func__), "self": self(value.__self__)}
+        if isinstance(value, Mobject):
+            return self.mobject(value)
+        if isinstance(value, (types.BuiltinFunctionType, np.ufunc)):
+            return f"<builtin {getattr(value, '__qualname__', value.__name__)}>"
+        if hasattr(value, "__dict__"):
+            return {"class": type(value).__qualname__, "attributes": self(vars(value))}
+        return f"<{type(value).__qualname__}>"
+
+    def function(self, func):
+        closure = []
+        for cell in func.__closure__ or ():
+            try:
+                closure.append(self(cell.cell_contents))
+            except ValueError:
+                closure.append("<empty cell>")
+        return {
+            "code": code_state(func.__code__),
+            "defaults": self(func.__defaults__),
+            "kwdefaults": self(func.__kwdefaults__),
+            "closure": closure,
+            "globals": {
+                name: self.global_value(func.__globals__[name])
+                for name in sorted(_global_names(func.__code__)) if name in func.__globals__
+            },
+        }
+
+    def global_value(self, value):
+        # Functions, data and mobjects a function reads by name; other module
+        # level objects (config, logger, consoles) only by type, as their
+        # state is not what the function computes with
+        Camera, ManimColor, Mobject, Scene = self.kinds
+        if isinstance(value, (types.FunctionType, np.ndarray, Mobject, ManimColor, list, tuple, dict,
+                              type(None), bool, int, float, str, np.generic, types.ModuleType, type)):
+            return self(value)
+        return f"<{type(value).__qualname__}>"
+
+    def mobject(self, mobject):
+        # Caches are derived from the points and filled whenever a lookup ran,
+        # so they would make the same mobject hash differently
+        skipped = MOBJECT_SKIPPED | set(getattr(mobject, "CACHE_ATTRIBUTES", ()))
+        return {
+            "class": type(mobject).__qualname__,
+            "points": array_digest(mobject.points),
+            "updaters": [self(updater) for updater in getattr(mobject, "updaters", [])],
+            "attributes": self({key: value for key, value in vars(mobject).items() if key not in skipped}),
+            "submobjects": [self(submobject) for submobject in mobject.submobjects],
+        }
+
+
+def camera_state(camera, mobjects):
+    describe = Describer()
+    state = {key: describe(value) for key, value in vars(camera).items() if key not in CAMERA_SKIPPED}
+    family = [member for mobject in mobjects for member in mobject.get_family()]
+    for key in ("fixed_in_frame_mobjects", "fixed_orientation_mobjects"):
+        fixed = getattr(camera, key, ())
+        # Positions in the current scene, not everything ever fixed
+        state[key] = [index for index, member in enumerate(family) if member in fixed]
+    return state
+
+
+def label(mobject):
+    text = getattr(mobject, "tex_string", None) or getattr(mobject, "text", None)
+    return f"{type(mobject).__name__}({text[:40]!r})" if isinstance(text, str) else type(mobject).__name__
+
+
+def _collect(state, key):
+    # All values of key in a mobject state and its submobjects' states
+    if not isinstance(state, dict) or "class" not in state:
+        return []
+    return [state.get(key)] + [value for sub in state.get("submobjects", []) for value in _collect(sub, key)]
+
+
+def _without(state, keys):
+    if not isinstance(state, dict) or "class" not in state:
+        return state
+    return {
+        key: [_without(sub, keys) for sub in value] if key == "submobjects" else value
+        for key, value in state.items() if key not in keys
+    }
+
+
+def aspects(state):
+    """Separate fingerprints for a mobject family's points, updaters and everything else"""
+    return {
+        "points": digest(_collect(state, "points")),
+        "updaters": digest(_collect(state, "updaters")),
+        "style and attributes": digest(_without(state, {"points", "updaters"})),
+    }
+
+
+class HashRecorder:
+    """Computes the stable hash of every play and keeps the report of one scene"""
+
+    def __init__(self):
+        self.scene_name = None
+        self.previous = []
+        self.plays = []
+
+    def start(self, scene):
+        self.scene_name = type(scene).__name__
+        self.previous = load_json(REPORTS_DIR / f"{self.scene_name}.json", {}).get("plays", [])
+        self.plays = []
+
+    def hash_play(self, scene, camera, animations, mobjects):
+        if type(scene).__name__ != self.scene_name:
+            self.start(scene)
+        camera_fields = camera_state(camera, mobjects)
+        describe = Describer()
+        animation_states = [describe(animation) for animation in animations]
+        describe = Describer()
+        mobject_states = [describe(mobject) for mobject in mobjects]
+        play_hash = f"{digest(camera_fields)}_{digest(animation_states)}_{digest(mobject_states)}"
+
+        record = {
+            "index": len(self.plays),
+            "hash": play_hash,
+            "camera": {key: digest(value) for key, value in camera_fields.items()},
+            "animations": [
+                {"label": type(animation).__name__, "digest": digest(state)}
+                for animation, state in zip(animations, animation_states)
+            ],
+            "mobjects": [
+                {"label": label(mobject), "digest": digest(state), "aspects": aspects(state)}
+                for mobject, state in zip(mobjects, mobject_states)
+            ],
+        }
+        record["cached"] = scene.renderer.file_writer.is_already_cached(play_hash)
+        if not record["cached"]:
+            record["reasons"] = self.reasons(record)
+            from manim import logger
+
+            logger.info(f"{self.scene_name} play {record['index']} not cached: {'; '.join(record['reasons'])}")
+        self.plays.append(record)
+        write_json(REPORTS_DIR / f"{self.scene_name}.json", {"scene": self.scene_name, "plays": self.plays})
+        return play_hash
+
+    def reasons(self, record):
+        """What differs from the same play of the previous render"""
+        if record["index"] >= len(self.previous):
+            return ["no previous render of this play"]
+        old = self.previous[record["index"]]
+        if old["hash"] == record["hash"]:
+            return ["same hash as last time; its partial movie file is gone"]
+        reasons = [
+            f"camera {key} changed" for key in sorted(set(old["camera"]) | set(record["camera"]))
+            if old["camera"].get(key) != record["camera"].get(key)
+        ]
+        if [a["digest"] for a in old["animations"]] != [a["digest"] for a in record["animations"]]:
+            reasons.append(
+                f"animations {', '.join(a['label'] for a in old['animations'])} -> "
+                f"{', '.join(a['label'] for a in record['animations'])}"
+            )
+        for index, (before, after) in enumerate(zip(old["mobjects"], record["mobjects"])):
+            if before["digest"] != after["digest"]:
+                changed = [key for key in after["aspects"] if before["aspects"].get(key) != after["aspects"][key]]
+                name = after["label"] if before["label"] == after["label"] else f"{before['label']} -> {after['label']}"
+                reasons.append(f"mobject {index} {name}: {', '.join(changed) or 'changed'}")
+        for extra in old["mobjects"][len(record["mobjects"]):]:
+            reasons.append(f"{extra['label']} no longer in the scene")
+        for extra in record["mobjects"][len(old["mobjects"]):]:
+            reasons.append(f"{extra['label']} added to the scene")
+        return reasons or ["changed outside the recorded fingerprints"]
+
+
+recorder = HashRecorder()
+
+
+def install():
+    import manim.renderer.cairo_renderer as cairo_renderer
+
+    cairo_renderer.get_hash_from_play_call = recorder.hash_play
+
+
+def print_report(scene_name):
+    report = load_json(REPORTS_DIR / f"{scene_name}.json")
+    if report is None:
+        raise SystemExit(f"no hash report for {scene_name}; render it with {ENVIRONMENT_VARIABLE}=1")
+    missed = [play for play in report["plays"] if not play["cached"]]
+    print(f"{scene_name}: {len(report['plays'])} plays, {len(missed)} rendered")
+    for play in missed:
+        print(f"  play {play['index']:>3} ({', '.join(a['label'] for a in play['animations'])})")
+        for reason in play["reasons"]:
+            print(f"      {reason}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="+")
+    args = parser.parse_args()
+    for scene in args.scenes:
+        print_report(scene)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Render a scene through one long-lived ffmpeg process instead of one per play.
+
+    python streaming_writer.py TorusCover -q h
+    python streaming_writer.py TorusCover -q h --no-partials
+
+manim normally encodes every play into its own file in partial_movie_files
+(one ffmpeg process each) and concatenates them at the end. With
+StreamingFileWriter the scene's frames go straight into a single encoder
+that writes media/videos/<file>/<quality>/<Scene>.mp4:
+
+- frames are copied into a preallocated ring of frame buffers, so the
+  render loop never allocates and only blocks when the encoder is a full
+  ring behind;
+- a writer thread drains the ring into ffmpeg's stdin, so rasterizing the
+  next frame overlaps with piping and encoding the previous ones;
+- unless disabled, the same thread also encodes each play into its usual
+  partial movie file and the file list is written at the end, so later
+  `manim render` runs (and media_cache.py) find the cache as if manim had
+  written it.
+
+Every play is rendered; cached partial files are not reused, since their
+frames would have to be decoded again to reach the single encoder.
+"""
+import argparse
+import os
+import queue
+import subprocess
+import threading
+from pathlib import Path
+
+import numpy as np
+from manim import SceneFileWriter, config, tempconfig
+
+from rendering import MEDIA_DIR, QUALITIES, find_scenes, load_scene_class, quality_config, video_path
+
+RING_SIZE = 32
+
+
+def open_encoder(path, width, height, frame_rate):
+    """An ffmpeg process that reads raw RGBA frames on stdin, with manim's H.264 settings"""
+    return subprocess.Popen(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-s", f"{width}x{height}",
+         "-pix_fmt", "rgba", "-r", str(frame_rate), "-i", "-", "-an",
+         "-vcodec", "libx264", "-pix_fmt", "yuv420p", str(path)],
+        stdin=subprocess.PIPE
+    )
+
+
+def close_encoder(process):
+    process.stdin.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg exited with status {process.returncode}")
+
+
+class StreamingFileWriter(SceneFileWriter):
+    """SceneFileWriter that streams the whole scene to one encoder (see above)"""
+
+    def __init__(self, renderer, scene_name, write_partial_files=True, ring_size=RING_SIZE, **kwargs):
+        super().__init__(renderer, scene_name, **kwargs)
+        self.write_partial_files = write_partial_files
+        self._ring = np.zeros((ring_size, config.pixel_height, config.pixel_width, 4), dtype=np.uint8)
+        self._free_slots = queue.Queue()
+        for slot in range(ring_size):
+            self._free_slots.put(slot)
+        self._jobs = queue.Queue()
+        self._writer = None
+        self._error = None
+        self._written_partials = []
+
+    def is_already_cached(self, hash_invocation):
+        # Every play must reach the single encoder
+        return False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        if not (allow_write and config.write_to_movie):
+            return
+        if self._writer is None:
+            self._start_writer()
+        partial_file = None
+        if self.write_partial_files and self.partial_movie_files:
+            partial_file = self.partial_movie_files[-1]
+        self._jobs.put(("begin", partial_file))
+
+    def end_animation(self, allow_write=False):
+        if allow_write and config.write_to_movie and self._writer is not None:
+            self._jobs.put(("end", None))
+
+    def write_frame(self, frame_or_renderer, num_frames=1):
+        if not config.write_to_movie or self._writer is None:
+            return
+        if self._error is not None:
+            raise self._error
+        slot = self._free_slots.get()
+        self._ring[slot] = frame_or_renderer
+        self._jobs.put(("frame", (slot, num_frames)))
+
+    def _start_writer(self):
+        self.movie_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._encoder = open_encoder(self.movie_file_path, config.pixel_width, config.pixel_height, config.frame_rate)
+        self._writer = threading.Thread(target=self._drain, name="frame writer", daemon=True)
+        self._writer.start()
+
+    def _drain(self):
+        partial, partial_path = None, None
+        try:
+            while True:
+                kind, value = self._jobs.get()
+                if kind == "frame":
+                    slot, num_frames = value
+                    data = self._ring[slot].data
+                    for _ in range(num_frames):
+                        self._encoder.stdin.write(data)
+                        if partial is not None:
+                            partial.stdin.write(data)
+                    self._free_slots.put(slot)
+                elif kind == "begin" and value is not None:
+                    partial_path = Path(value)
+                    partial = open_encoder(
+                        partial_path.with_name(f"{partial_path.stem}_temp{partial_path.suffix}"),
+                        config.pixel_width, config.pixel_height, config.frame_rate
+                    )
+                elif kind == "end" and partial is not None:
+                    close_encoder(partial)
+                    os.replace(partial_path.with_name(f"{partial_path.stem}_temp{partial_path.suffix}"), partial_path)
+                    self._written_partials.append(partial_path)
+                    partial = None
+                elif kind == "stop":
+                    return
+        except Exception as error:
+            self._error = error
+            # Keep the render loop from waiting on a slot forever
+            while True:
+                kind, value = self._jobs.get()
+                if kind == "frame":
+                    self._free_slots.put(value[0])
+                elif kind == "stop":
+                    return
+
+    def finish(self):
+        if not config.write_to_movie or self._writer is None:
+            return super().finish()
+        self._jobs.put(("stop", None))
+        self._writer.join()
+        close_encoder(self._encoder)
+        if self._error is not None:
+            raise self._error
+        if self._written_partials:
+            # Same list manim writes when it combines, so the cache stays usable
+            (self.partial_movie_directory / "partial_movie_file_list.txt").write_text(
+                "# This file is used internally by FFMPEG.\n"
+                + "".join(f"file 'file:{path.as_posix()}'\n" for path in self._written_partials)
+            )
+        self.print_file_ready_message(self.movie_file_path)
+
+
+def render_streaming(file, scene_name, quality="h", write_partial_files=True):
+    scene_class = load_scene_class(file, scene_name)
+    output = video_path(file, scene_name, quality)
+    with tempconfig({**quality_config(quality), "media_dir": str(MEDIA_DIR), "video_dir": str(output.parent)}):
+        scene = scene_class()
+        # Replaces the writer CairoRenderer.init_scene created
+        scene.renderer.file_writer = StreamingFileWriter(
+            scene.renderer, scene_name, write_partial_files=write_partial_files
+        )
+        scene.render()
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scene")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="h")
+    parser.add_argument("--no-partials", action="store_true", help="do not write partial movie files")
+    args = parser.parse_args()
+    file = next(file for file, scene in find_scenes() if scene == args.scene)
+    render_streaming(file, args.scene, args.quality, write_partial_files=not args.no_partials)
+
+
+if __name__ == "__main__":
+    main()
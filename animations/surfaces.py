@@ -0,0 +1,389 @@
+from manim import *
+import numpy as np
+
+from mesh_cache import function_fingerprint, mesh_cache
+
+# Parametrizations shared by the scenes. They only use NumPy ufuncs (no Python
+# branches on u or v), so the same function works on scalars, as Surface and
+# ParametricFunction call it, and on whole arrays of samples.
+
+def torus_func(u, v, major_radius=1.5, minor_radius=0.5):
+    return np.array([
+        (major_radius + minor_radius * np.cos(v)) * np.cos(u),
+        (major_radius + minor_radius * np.cos(v)) * np.sin(u),
+        minor_radius * np.sin(v)
+    ])
+
+
+def mobius_func(u, v, radius=1.5):
+    return np.array([
+        (radius + v * np.cos(u / 2)) * np.cos(u),
+        (radius + v * np.cos(u / 2)) * np.sin(u),
+        v * np.sin(u / 2)
+    ])
+
+
+def klein_bottle_func(u, v):
+    # u and v run over [0, 1]; the two halves of the figure-8 immersion are
+    # selected with np.where instead of an if on u
+    u, v = u * 2 * PI, v * 2 * PI
+    r = 4 * (1 - np.cos(u) / 2)
+    upper = u < PI
+    x = 6 * np.cos(u) * (1 + np.sin(u)) + np.where(
+        upper, r * np.cos(u) * np.cos(v), -r * np.cos(v)
+    )
+    y = r * np.sin(v)
+    z = 16 * np.sin(u) + np.where(upper, r * np.sin(u) * np.cos(v), 0)
+    # Return rotated coordinates to make it stand up
+    return np.array([x, y, z]) * 0.1
+
+
+def cylinder_wrap_func(u, v, alpha=1, width=2 * PI, radius=2):
+    # Flat strip of the given width at alpha = 0, cylinder of the given radius at alpha = 1
+    return np.array([
+        (1 - alpha) * (u - PI) * width / (2 * PI) + alpha * radius * np.cos(u),
+        alpha * radius * np.sin(u),
+        v + 0 * u
+    ])
+
+
+def evaluate_grid(func, u_values, v_values):
+    """Evaluate func on the meshgrid of u_values x v_values in a single call.
+
+    Returns an array of shape (len(u_values), len(v_values), 3).
+    """
+    u_grid, v_grid = np.meshgrid(u_values, v_values, indexing="ij")
+    return np.stack(
+        [np.broadcast_to(c, u_grid.shape) for c in func(u_grid, v_grid)],
+        axis=-1
+    ).astype(float)
+
+
+# Where the 16 Bézier points of face (i, j) come from: the corner grid (0) or
+# the handles leaving a corner towards +u (1), -u (2), +v (3) or -v (4), at
+# (i + row, j + column). The -u and -v handles are stored by the face edge
+# they belong to, i.e. by the corner they start from minus one. The faces
+# run (u1, v1) -> (u2, v1) -> (u2, v2) -> (u1, v2) -> (u1, v1), as in Surface
+_FACE_KINDS = np.array([0, 1, 2, 0, 0, 3, 4, 0, 0, 2, 1, 0, 0, 4, 3, 0])
+_FACE_ROWS = np.array([0, 0, 0, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0])
+_FACE_COLS = np.array([0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 0, 0, 0])
+
+
+class LevelOfDetail:
+    """Chooses where a surface is sampled so that its flat faces stay within
+    max_error pixels of the true surface on screen.
+
+    A flat face deviates from the surface by about h^2 |f''| / 8 over a side
+    of parameter length h, so along each parameter direction the samples are
+    spaced with density sqrt(|f''| / (8 * error)), where error is max_error
+    converted to scene units at the given zoom and output width. High
+    curvature regions (the Klein bottle's neck) get more rows, flat ones (a
+    cylinder along its axis) only min_resolution. Build it from the scene with
+    for_scene so the current camera and render quality are used; pass the
+    largest zoom the surface will be seen at as max_zoom.
+    """
+
+    def __init__(self, zoom=1, pixel_width=None, frame_width=None, max_error=0.5,
+                 min_resolution=4, max_resolution=160, focal_distance=20, scale=1):
+        self.zoom = zoom
+        self.pixel_width = pixel_width or config.pixel_width
+        self.frame_width = frame_width or config.frame_width
+        self.max_error = max_error
+        self.min_resolution = min_resolution
+        self.max_resolution = max_resolution
+        self.focal_distance = focal_distance
+        self.scale = scale
+
+    @classmethod
+    def for_scene(cls, scene, max_zoom=None, **kwargs):
+        camera = scene.renderer.camera
+        zoom = camera.get_zoom() if hasattr(camera, "get_zoom") else 1
+        return cls(
+            zoom=max(zoom, max_zoom or 0),
+            pixel_width=camera.pixel_width,
+            frame_width=camera.frame_width,
+            focal_distance=getattr(camera, "get_focal_distance", lambda: 20)(),
+            **kwargs
+        )
+
+    def error_in_scene_units(self, extent):
+        pixels_per_unit = self.pixel_width / self.frame_width * self.zoom * self.scale
+        # Parts of the surface nearer than the focal plane are drawn larger
+        perspective = self.focal_distance / max(self.focal_distance - extent * self.scale, 1)
+        return self.max_error / (pixels_per_unit * perspective)
+
+    def sample_values(self, funcs, u_range, v_range, pilot_resolution=96):
+        """u and v sample positions (face boundaries) for the surfaces funcs"""
+        u_pilot = np.linspace(*u_range, pilot_resolution + 1)
+        v_pilot = np.linspace(*v_range, pilot_resolution + 1)
+        grids = [evaluate_grid(func, u_pilot, v_pilot) for func in funcs]
+        points = np.concatenate([grid.reshape(-1, 3) for grid in grids])
+        extent = np.linalg.norm(points - points.mean(axis=0), axis=1).max()
+        error = self.error_in_scene_units(extent)
+        return (
+            self._equidistribute(u_pilot, [grid for grid in grids], error),
+            self._equidistribute(v_pilot, [grid.swapaxes(0, 1) for grid in grids], error),
+        )
+
+    def _equidistribute(self, pilot, grids, error):
+        # Largest |f''| along the first axis, over the other axis and all funcs
+        h = pilot[1] - pilot[0]
+        curvature = np.zeros(len(pilot))
+        for grid in grids:
+            second = np.linalg.norm(grid[2:] - 2 * grid[1:-1] + grid[:-2], axis=-1).max(axis=1) / h ** 2
+            curvature = np.maximum(curvature, np.concatenate([second[:1], second, second[-1:]]))
+        density = np.sqrt(curvature / (8 * error))
+        cumulative = np.concatenate([[0], np.cumsum((density[1:] + density[:-1]) / 2 * h)])
+        count = int(np.clip(np.ceil(cumulative[-1]), self.min_resolution, self.max_resolution))
+        # Blend in a uniform part so flat stretches still get their share of min_resolution rows
+        cumulative += (pilot - pilot[0]) / (pilot[-1] - pilot[0]) * max(cumulative[-1], 1) / count
+        return np.interp(np.linspace(0, cumulative[-1], count + 1), cumulative, pilot)
+
+
+class GridSurface(Surface):
+    """A Surface whose faces are mapped by evaluating func once on a (u, v) grid.
+
+    Surface applies its function to every Bézier point of every face, one
+    Python call at a time. GridSurface takes an array-aware func (see the
+    parametrizations above) and produces the same faces, up to rounding, from
+    five grid evaluations: the face corners, and each corner moved a tiny
+    step towards its four handles. Like Surface, which pulls handles towards
+    their anchors by pre_function_handle_to_anchor_scale_factor before
+    mapping and pushes them back after, a handle ends up at its mapped
+    anchor plus the tangent offset, not at func of the third point. With
+    use_mesh_cache the mapped points are also stored in the on-disk mesh
+    cache, so later renders only load them.
+
+    Given a LevelOfDetail as lod, the faces follow the sample positions it
+    chooses instead of the uniform resolution grid. Those move with the
+    camera and quality, so such a surface is drawn without the checkerboard
+    and face strokes unless they are asked for; keep an explicit resolution
+    where the face grid is part of the picture. With use_mesh_cache the
+    sample positions are cached as well, keyed on lod's parameters.
+    """
+
+    def __init__(self, func, u_range=[0, 1], v_range=[0, 1], use_mesh_cache=False, lod=None, **kwargs):
+        self._map_grid_on_init = True
+        self.use_mesh_cache = use_mesh_cache
+        self._sample_values = None
+        if lod is not None:
+            kwargs.setdefault("checkerboard_colors", False)
+            kwargs.setdefault("stroke_width", 0)
+            self._sample_values = self._lod_sample_values(lod, func, u_range, v_range)
+        super().__init__(func, u_range=u_range, v_range=v_range, **kwargs)
+
+    def _lod_funcs(self, func):
+        # Every shape the surface takes on, for the level of detail to cover
+        return [func]
+
+    def _lod_sample_values(self, lod, func, u_range, v_range):
+        funcs = self._lod_funcs(func)
+        if not self.use_mesh_cache:
+            return lod.sample_values(funcs, u_range, v_range)
+
+        def compute():
+            # u and v values in one array, preceded by the number of u values
+            u_values, v_values = lod.sample_values(funcs, u_range, v_range)
+            return np.concatenate([[len(u_values)], u_values, v_values])
+
+        key = mesh_cache.key(
+            "lod", *[function_fingerprint(f) for f in funcs], u_range, v_range, sorted(vars(lod).items())
+        )
+        values = np.array(mesh_cache.get_or_compute(key, compute))
+        count = int(values[0])
+        return values[1:count + 1], values[count + 1:]
+
+    def _get_u_values_and_v_values(self):
+        if self._sample_values is None:
+            return super()._get_u_values_and_v_values()
+        u_values, v_values = self._sample_values
+        self.resolution = (len(u_values) - 1, len(v_values) - 1)
+        return u_values, v_values
+
+    def _setup_in_uv_space(self):
+        super()._setup_in_uv_space()
+        u_values, v_values = self._get_u_values_and_v_values()
+        self.faces = list(self.submobjects)
+        self.u_values = np.asarray(u_values, dtype=float)
+        self.v_values = np.asarray(v_values, dtype=float)
+        u_index = np.array([face.u_index for face in self.faces])
+        v_index = np.array([face.v_index for face in self.faces])
+        self._face_rows = u_index[:, None] + _FACE_ROWS
+        self._face_cols = v_index[:, None] + _FACE_COLS
+
+    def apply_function(self, function, **kwargs):
+        if self._map_grid_on_init:
+            # Called once from Surface.__init__ with the per-point mapping
+            self._map_grid_on_init = False
+            if self.use_mesh_cache:
+                key = mesh_cache.key(
+                    function_fingerprint(self._func), "tangent handles",
+                    self.pre_function_handle_to_anchor_scale_factor, self.u_values, self.v_values
+                )
+                points = mesh_cache.get_or_compute(key, lambda: self.evaluate(self.func))
+            else:
+                points = self.evaluate(self.func)
+            self.set_face_points(points)
+            return self
+        return super().apply_function(function, **kwargs)
+
+    def evaluate(self, func):
+        """Points of every face under func, shape (number of faces, 16, 3)"""
+        u, v = self.u_values, self.v_values
+        factor = self.pre_function_handle_to_anchor_scale_factor
+        du, dv = np.diff(u) / 3, np.diff(v) / 3
+        corners = evaluate_grid(func, u, v)
+
+        def handles(anchors, nudged):
+            # Surface's scale_handle_to_anchor_distances(1 / factor) after mapping
+            return anchors + (nudged - anchors) / factor
+
+        samples = np.zeros((5,) + corners.shape)
+        samples[0] = corners
+        samples[1, :-1] = handles(corners[:-1], evaluate_grid(func, u[:-1] + factor * du, v))
+        samples[2, :-1] = handles(corners[1:], evaluate_grid(func, u[1:] - factor * du, v))
+        samples[3, :, :-1] = handles(corners[:, :-1], evaluate_grid(func, u, v[:-1] + factor * dv))
+        samples[4, :, :-1] = handles(corners[:, 1:], evaluate_grid(func, u, v[1:] - factor * dv))
+        return samples[_FACE_KINDS, self._face_rows, self._face_cols]
+
+    def get_face_points(self):
+        return np.array([face.points for face in self.faces])
+
+    def set_face_points(self, points):
+        for face, face_points in zip(self.faces, points):
+            if face.points.shape == face_points.shape:
+                # Reuse the existing coordinate buffer
+                face.points[...] = face_points
+            else:
+                face.points = np.array(face_points)
+        return self
+
+
+# The shapes shared by several scenes, tessellated once and then loaded from
+# the mesh cache. resolution is only used without a lod
+
+def torus_surface(major_radius=1.5, minor_radius=0.5, resolution=(40, 40), **kwargs):
+    return GridSurface(
+        lambda u, v: torus_func(u, v, major_radius, minor_radius),
+        u_range=[0, TAU],
+        v_range=[0, TAU],
+        resolution=resolution,
+        use_mesh_cache=True,
+        **kwargs
+    )
+
+
+def mobius_surface(radius=1.5, half_width=1, resolution=(60, 30), **kwargs):
+    return GridSurface(
+        lambda u, v: mobius_func(u, v, radius),
+        u_range=[0, TAU],
+        v_range=[-half_width, half_width],
+        resolution=resolution,
+        use_mesh_cache=True,
+        **kwargs
+    )
+
+
+def klein_bottle_surface(resolution=(100, 32), **kwargs):
+    return GridSurface(
+        klein_bottle_func,
+        u_range=[0, 1],
+        v_range=[0, 1],
+        resolution=resolution,
+        use_mesh_cache=True,
+        **kwargs
+    )
+
+
+def cylinder_surface(radius=1, height=2, resolution=(24, 24), show_ends=True, **kwargs):
+    """The same surface as Cylinder(radius, height, direction=OUT), end caps included"""
+    cylinder = GridSurface(
+        lambda u, v: np.array([radius * np.cos(v), radius * np.sin(v), u + 0 * v]),
+        u_range=[-height / 2, height / 2],
+        v_range=[0, TAU],
+        resolution=resolution,
+        use_mesh_cache=True,
+        **kwargs
+    )
+    if show_ends:
+        # Placed exactly where Cylinder.add_bases puts them
+        for z in cylinder.u_range:
+            cylinder.add(Circle(
+                radius=radius,
+                color=cylinder.fill_color,
+                fill_opacity=cylinder.fill_opacity,
+                shade_in_3d=True,
+                stroke_width=0
+            ).shift(z * IN))
+    return cylinder
+
+
+class MorphingSurface(GridSurface):
+    """A surface that blends two parametrizations sampled once on a shared grid.
+
+    func and target_func are both evaluated when the surface is built. After
+    that, set_alpha only writes weights(alpha)[0] * source + weights(alpha)[1] * target
+    into the existing faces, so any alpha (and any frame rate) costs one array
+    blend instead of a new Surface. Shifts, scales and rotations applied to the
+    surface itself are carried over to both keyframes.
+    """
+
+    def __init__(self, func, target_func, alpha=0, weights=lambda alpha: (1 - alpha, alpha), **kwargs):
+        self._keyframes = []
+        self.weights = weights
+        self.target_func = target_func
+        super().__init__(func, **kwargs)
+        self._keyframes = [self.evaluate(func), self.evaluate(target_func)]
+        self.set_alpha(alpha)
+
+    def _lod_funcs(self, func):
+        return [func, self.target_func]
+
+    def set_alpha(self, alpha):
+        self.alpha = alpha
+        source_weight, target_weight = self.weights(alpha)
+        source, target = self._keyframes
+        return self.set_face_points(source_weight * source + target_weight * target)
+
+    def shift(self, *vectors):
+        super().shift(*vectors)
+        total_vector = np.sum(vectors, axis=0)
+        self._keyframes = [keyframe + total_vector for keyframe in self._keyframes]
+        return self
+
+    def apply_points_function_about_point(self, func, about_point=None, about_edge=None):
+        if about_point is None:
+            about_point = self.get_critical_point(ORIGIN if about_edge is None else about_edge)
+        super().apply_points_function_about_point(func, about_point=about_point)
+        self._keyframes = [
+            func((keyframe - about_point).reshape(-1, 3)).reshape(keyframe.shape) + about_point
+            for keyframe in self._keyframes
+        ]
+        return self
+
+
+class DeformableSurface(GridSurface):
+    """A surface that follows a parametrization func(u, v, alpha) as alpha changes.
+
+    The faces, their style and the (u, v) lattice are created once; set_alpha
+    re-evaluates func on the lattice and writes the result into the existing
+    point buffers, so animating it needs neither a new Surface nor become().
+    The points come straight from func, so reposition the surface after
+    set_alpha if it has been moved.
+    """
+
+    def __init__(self, func, alpha=0, **kwargs):
+        self.deformation = func
+        self.alpha = alpha
+        super().__init__(lambda u, v: func(u, v, alpha), **kwargs)
+
+    def _lod_funcs(self, func):
+        # Not closing over self keeps these fingerprintable for the mesh cache
+        deformation = self.deformation
+        return [lambda u, v, alpha=alpha: deformation(u, v, alpha) for alpha in np.linspace(0, 1, 5)]
+
+    def set_alpha(self, alpha):
+        self.alpha = alpha
+        return self.set_face_points(
+            self.evaluate(lambda u, v: self.deformation(u, v, alpha))
+        )
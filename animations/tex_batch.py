@@ -0,0 +1,180 @@
+"""Compile every Tex string the scenes need in one LaTeX run per template.
+
+    python tex_batch.py                 # all scenes
+    python tex_batch.py TorusCover      # only some
+
+manim compiles each new Tex/MathTex string on its own: one latex and one
+dvisvgm process per string, started one after another while the scene is
+being constructed. Here a dry run of each scene collects the strings
+whose SVG is not in media/Tex yet, writes them as the pages of a single
+document, compiles that once and splits the pages back into the usual
+<hash>.svg files, so the real render finds everything cached.
+
+During collection missing strings get a placeholder SVG. When a scene
+cannot run on placeholders (e.g. it indexes into a formula's glyphs), what
+was collected so far is compiled and the scene is run again.
+"""
+import argparse
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+
+from rendering import MEDIA_DIR, dry_run, find_scenes
+
+MAX_ROUNDS = 5
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1">'
+    '<path d="M0 0h1v1h-1z"/></svg>\n'
+)
+BEGIN_DOCUMENT = r"\begin{document}"
+END_DOCUMENT = r"\end{document}"
+
+
+@contextmanager
+def collecting_tex_files():
+    """Stand in a placeholder for each Tex string not compiled yet and collect {tex file: template}"""
+    import manim.mobject.text.tex_mobject as tex_mobject
+    from manim import config
+    from manim.utils.tex_file_writing import generate_tex_file
+
+    pending = {}
+    placeholder = Path(config.get_dir("tex_dir")) / "placeholder.svg"
+    placeholder.parent.mkdir(parents=True, exist_ok=True)
+    placeholder.write_text(PLACEHOLDER_SVG)
+    tex_to_svg_file = tex_mobject.tex_to_svg_file
+
+    def collected(expression, environment=None, tex_template=None):
+        tex_template = tex_template or config.tex_template
+        tex_file = generate_tex_file(expression, environment, tex_template)
+        if tex_file.with_suffix(".svg").exists():
+            return tex_file.with_suffix(".svg")
+        pending[tex_file] = tex_template
+        return placeholder
+
+    tex_mobject.tex_to_svg_file = collected
+    try:
+        yield pending
+    finally:
+        tex_mobject.tex_to_svg_file = tex_to_svg_file
+        placeholder.unlink(missing_ok=True)
+
+
+def collect(file, scene):
+    """Tex files the scene needs that are not compiled yet, and whether the dry run got through"""
+    with collecting_tex_files() as pending:
+        try:
+            dry_run(file, scene)
+            finished = True
+        except Exception:
+            finished = False
+    return pending, finished
+
+
+def split_document(tex_file):
+    text = Path(tex_file).read_text(encoding="utf-8")
+    preamble, _, rest = text.partition(BEGIN_DOCUMENT)
+    body = rest.rpartition(END_DOCUMENT)[0]
+    return preamble, body
+
+
+def compile_batch(tex_files, tex_template):
+    """Compile tex_files, which share tex_template, as the pages of one document.
+
+    Falls back to compiling them one by one if the batch fails, so that a
+    broken string is reported by manim as usual.
+    """
+    from manim.utils.tex_file_writing import compile_tex
+
+    tex_files = sorted(tex_files)
+    preamble = split_document(tex_files[0])[0]
+    if r"{standalone}" not in preamble or len(tex_files) == 1:
+        for tex_file in tex_files:
+            compile_single(tex_file, tex_template)
+        return
+
+    # standalone's multi mode makes each snippet environment a cropped page of its own
+    preamble = preamble.replace(r"\documentclass[", r"\documentclass[multi=snippet,", 1)
+    pages = "".join(
+        f"\\begin{{snippet}}{split_document(tex_file)[1]}\\end{{snippet}}\n" for tex_file in tex_files
+    )
+    batch_file = tex_files[0].with_name(f"batch_{tex_files[0].stem}.tex")
+    batch_file.write_text(
+        f"{preamble}\\newenvironment{{snippet}}{{}}{{}}\n{BEGIN_DOCUMENT}\n{pages}{END_DOCUMENT}\n",
+        encoding="utf-8"
+    )
+    # dvisvgm zero-pads page numbers; give the width explicitly so the names are known
+    width = len(str(len(tex_files)))
+    try:
+        dvi_file = compile_tex(batch_file, tex_template.tex_compiler, tex_template.output_format)
+        subprocess.run(
+            ["dvisvgm", *(["--pdf"] if tex_template.output_format == ".pdf" else []),
+             "--page=1-", "--no-fonts", "--verbosity=0",
+             f"--output={batch_file.with_suffix('').as_posix()}-%{width}p.svg", dvi_file.as_posix()],
+            check=True
+        )
+        page_files = [
+            batch_file.with_name(f"{batch_file.stem}-{page:0{width}}.svg") for page in range(1, len(tex_files) + 1)
+        ]
+        if not all(page_file.exists() for page_file in page_files):
+            raise RuntimeError(f"{batch_file.name} did not produce one page per snippet")
+        for tex_file, page_file in zip(tex_files, page_files):
+            page_file.replace(tex_file.with_suffix(".svg"))
+    except Exception as error:
+        print(f"batch compile failed ({error}), compiling {len(tex_files)} strings one by one")
+        for tex_file in tex_files:
+            compile_single(tex_file, tex_template)
+    finally:
+        for leftover in batch_file.parent.glob(f"{batch_file.stem}*"):
+            leftover.unlink(missing_ok=True)
+
+
+def compile_single(tex_file, tex_template):
+    from manim.utils.tex_file_writing import compile_tex, convert_to_svg
+
+    dvi_file = compile_tex(tex_file, tex_template.tex_compiler, tex_template.output_format)
+    convert_to_svg(dvi_file, tex_template.output_format)
+
+
+def compile_pending(pending):
+    by_template = {}
+    for tex_file, tex_template in pending.items():
+        key = (split_document(tex_file)[0], tex_template.tex_compiler, tex_template.output_format)
+        by_template.setdefault(key, (tex_template, []))[1].append(tex_file)
+    for tex_template, tex_files in by_template.values():
+        compile_batch(tex_files, tex_template)
+
+
+def prepare_tex(scenes):
+    """Make sure media/Tex has every Tex string the scenes use"""
+    remaining = list(scenes)
+    for _ in range(MAX_ROUNDS):
+        pending, unfinished = {}, []
+        for file, scene in remaining:
+            scene_pending, finished = collect(file, scene)
+            pending.update(scene_pending)
+            if not finished:
+                unfinished.append((file, scene))
+        if pending:
+            print(f"compiling {len(pending)} Tex strings")
+            compile_pending(pending)
+        # A scene that fails with nothing new to compile fails for another reason;
+        # the render will report it
+        remaining = [scene for scene in unfinished if pending]
+        if not remaining:
+            return
+    print("gave up collecting Tex for " + ", ".join(scene for _, scene in remaining))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenes", nargs="*", help="scene names (default: all)")
+    args = parser.parse_args()
+    scenes = find_scenes()
+    if args.scenes:
+        scenes = [scene for scene in scenes if scene[1] in args.scenes]
+    prepare_tex(scenes)
+    print(f"{len(list((MEDIA_DIR / 'Tex').glob('*.svg')))} SVGs in media/Tex")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Typeset Tex and MathTex without LaTeX for preview renders.
+
+Renders started through rendering.py install it when MANIM_TEX_PREVIEW=1
+is set (`render_all.py --preview` sets it):
+
+    MANIM_TEX_PREVIEW=1 python rendering.py -ql --media_dir media/preview CoveringRtoS1.py CoveringRtoS1
+
+In preview mode each string is looked up in the real cache, media/Tex,
+first. Strings that were never compiled are drawn with matplotlib's
+mathtext in Computer Modern at LaTeX's 10pt, which gives glyph outlines of
+about the size and extent LaTeX would produce, and are cached as SVGs in
+the preview media folder. No latex or dvisvgm process is started.
+Constructs mathtext does not know are drawn as plain text.
+
+Production renders leave the environment variable unset and keep real
+LaTeX. Render previews into their own --media_dir so that their videos and
+partial movies never mix with production ones.
+"""
+import os
+import re
+from pathlib import Path
+
+ENVIRONMENT_VARIABLE = "MANIM_TEX_PREVIEW"
+LATEX_CACHE = Path(__file__).resolve().parent / "media" / "Tex"
+FONT_SIZE = 10  # pt, the size of LaTeX's default body text
+
+_MATH = re.compile(r"(\$[^$]*\$)")
+_TEXT_COMMAND = re.compile(r"\\text(?:bf|it|rm|sf|tt)?\{([^{}]*)\}")
+
+
+def preview_requested():
+    return os.environ.get(ENVIRONMENT_VARIABLE, "") not in ("", "0")
+
+
+def to_mathtext(expression, environment=None):
+    """Lines of a Tex/MathTex expression in matplotlib's mathtext syntax"""
+    lines = [line.strip() for line in expression.split(r"\\")]
+    if environment is not None:
+        # MathTex: the whole line is math; alignment points do not apply
+        return [f"${line.replace('&', '')}$" for line in lines if line]
+    # Tex: text with inline $...$ math; text-mode commands are reduced to their argument
+    return [
+        "".join(part if _MATH.fullmatch(part) else _TEXT_COMMAND.sub(r"\1", part) for part in _MATH.split(line))
+        for line in lines if line
+    ]
+
+
+def plain_text(lines):
+    """Fallback for strings mathtext cannot parse: drop $ and backslash commands"""
+    text = "\n".join(lines)
+    text = _TEXT_COMMAND.sub(r"\1", text)
+    text = re.sub(r"\\([A-Za-z]+)", r"\1", text)
+    return text.replace("$", "").replace("{", "").replace("}", "")
+
+
+def render_mathtext(lines, svg_file):
+    try:
+        from matplotlib import rc_context
+        from matplotlib.figure import Figure
+    except ImportError as error:
+        raise ImportError(
+            f"{ENVIRONMENT_VARIABLE} needs matplotlib for strings that are not in media/Tex yet "
+            "(pip install matplotlib), or unset it to use LaTeX"
+        ) from error
+
+    style = {"mathtext.fontset": "cm", "font.family": "serif", "font.serif": ["cmr10"],
+             "axes.unicode_minus": False, "svg.hashsalt": "manim-preview"}
+
+    def save(text):
+        figure = Figure()
+        figure.patch.set_visible(False)
+        figure.text(0, 0, text, fontsize=FONT_SIZE, multialignment="center")
+        figure.savefig(svg_file, format="svg", bbox_inches="tight", pad_inches=0, metadata={"Date": None})
+
+    with rc_context(style):
+        try:
+            save("\n".join(lines))
+        except ValueError:
+            save(plain_text(lines))
+    return svg_file
+
+
+def preview_tex_to_svg_file(expression, environment=None, tex_template=None):
+    from manim import config
+    from manim.utils.tex_file_writing import generate_tex_file
+
+    tex_file = generate_tex_file(expression, environment, tex_template or config.tex_template)
+    for svg_file in (LATEX_CACHE / f"{tex_file.stem}.svg", tex_file.with_suffix(".svg")):
+        if svg_file.exists():
+            return svg_file
+    return render_mathtext(to_mathtext(expression, environment), tex_file.with_suffix(".svg"))
+
+
+def install():
+    import manim.mobject.text.tex_mobject as tex_mobject
+
+    tex_mobject.tex_to_svg_file = preview_tex_to_svg_file
+
@@ -0,0 +1,76 @@
+from manim import *
+import numpy as np
+
+
+class TrackerBound:
+    """Mixin for mobjects whose geometry is a function of one or more ValueTrackers.
+
+    Unlike always_redraw, nothing is rebuilt: the updater reads the tracker
+    values and, only if they changed since the last frame, moves the control
+    points of the existing mobject by calling follow(*values), which each
+    class passes to bind_trackers.
+    """
+
+    def bind_trackers(self, trackers, follow):
+        self.trackers = trackers
+        self.follow = follow
+        self._tracker_values = self.get_tracker_values()
+        self.add_updater(lambda mob: mob.sync_with_trackers())
+        return self
+
+    def get_tracker_values(self):
+        return tuple(tracker.get_value() for tracker in self.trackers)
+
+    def sync_with_trackers(self):
+        values = self.get_tracker_values()
+        if values != self._tracker_values:
+            self._tracker_values = values
+            self.follow(*values)
+        return self
+
+
+def _inset(start, end, buff):
+    # The same shortening Line applies for its buff
+    start, end = np.array(start, dtype=float), np.array(end, dtype=float)
+    length = np.linalg.norm(end - start)
+    if buff == 0 or length < 2 * buff:
+        return start, end
+    unit = (end - start) / length
+    return start + buff * unit, end - buff * unit
+
+
+class TrackedDot(TrackerBound, Dot):
+    """A Dot at point_func(*tracker values)"""
+
+    def __init__(self, point_func, *trackers, **kwargs):
+        self.point_func = point_func
+        super().__init__(point_func(*(tracker.get_value() for tracker in trackers)), **kwargs)
+        self.bind_trackers(trackers, self.move_to_values)
+
+    def move_to_values(self, *values):
+        self.move_to(self.point_func(*values))
+
+
+class TrackedArrow(TrackerBound, Arrow):
+    """An Arrow from start_func(*tracker values) to end_func(*tracker values).
+
+    The tip is kept and only resized, so its length and the stroke width
+    follow the same length ratios as a freshly built Arrow.
+    """
+
+    def __init__(self, start_func, end_func, *trackers, **kwargs):
+        self.start_func = start_func
+        self.end_func = end_func
+        values = [tracker.get_value() for tracker in trackers]
+        super().__init__(start_func(*values), end_func(*values), **kwargs)
+        self.bind_trackers(trackers, self.move_to_values)
+
+    def move_to_values(self, *values):
+        start, end = _inset(self.start_func(*values), self.end_func(*values), self.buff)
+        if np.linalg.norm(end - start) == 0 or not self.has_tip():
+            return
+        tip = self.pop_tips()[0]
+        # No tip attached, so Arrow.scale only rescales the shaft and its stroke width
+        self.put_start_and_end_on(start, end)
+        tip.scale(self.get_default_tip_length() / tip.length)
+        self.add_tip(tip=tip)